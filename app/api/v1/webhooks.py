@@ -260,6 +260,8 @@ async def update_bot(bot_id: str, request: BotUpdateRequest):
     update_data = request.model_dump(exclude_unset=True)
     
     updated_bot = await bot_manager.update_bot(bot_id, **update_data)
+    if "allowed_users" in update_data:
+        command_handler.invalidate_user(bot_id)
     
     return BotResponse(
         bot_id=updated_bot.bot_id,
@@ -292,6 +294,7 @@ async def delete_bot(bot_id: str):
         await client.delete_webhook()
     
     await bot_manager.unregister_bot(bot_id)
+    command_handler.invalidate_user(bot_id)
     logger.info(f"Deleted bot: {bot_id}")
 
 
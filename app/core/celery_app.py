@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init
 import sentry_sdk
 from sentry_sdk.integrations.celery import CeleryIntegration
 from app.core.config import settings
@@ -24,3 +25,10 @@ celery_app.conf.task_routes = {
 celery_app.conf.update(
     result_expires=3600,
 )
+
+
+@worker_process_init.connect
+def preload_scrapers(**kwargs):
+    if settings.SCRAPER_PRELOAD:
+        from app.services.scrapers.factory import ScraperFactory
+        ScraperFactory.preload()
@@ -84,6 +84,18 @@ class Settings(BaseSettings):
         default="HTML",
         description="Message parse mode: HTML or Markdown",
     )
+    TELEGRAM_RATE_LIMIT_ENABLED: bool = Field(
+        default=True,
+        description="Throttle outbound Telegram calls through Redis token buckets",
+    )
+    TELEGRAM_BOT_RATE_PER_SECOND: int = Field(
+        default=30,
+        description="Max outbound messages per second for each bot",
+    )
+    TELEGRAM_GROUP_RATE_PER_MINUTE: int = Field(
+        default=20,
+        description="Max outbound messages per minute to a single group or channel",
+    )
 
     # ============== Selenium Configuration ==============
     SELENIUM_HEADLESS: bool = Field(
@@ -110,6 +122,10 @@ class Settings(BaseSettings):
         default=None,
         description="Path to ChromeDriver (auto-detected if not set)",
     )
+    SELENIUM_POOL_SIZE: int = Field(
+        default=4,
+        description="Maximum Chrome instances kept alive, shared by the API process and its browser workers (min 2)",
+    )
     SELENIUM_USER_AGENT: str = Field(
         default="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         description="User agent string for Selenium",
@@ -118,6 +134,26 @@ class Settings(BaseSettings):
         default="/app/screenshots",
         description="Directory to save screenshots",
     )
+    SELENIUM_DISABLE_IMAGES: bool = Field(
+        default=True,
+        description="Block image downloads unless a screenshot or image attribute is needed",
+    )
+    SELENIUM_DISABLE_CSS: bool = Field(
+        default=False,
+        description="Block stylesheet downloads (may break visibility-based waits)",
+    )
+    SELENIUM_BLOCKED_URLS: str = Field(
+        default="*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,*facebook.net*,*hotjar.com*",
+        description="Comma-separated URL patterns the browser should never load",
+    )
+    SCRAPER_STATIC_FIRST: bool = Field(
+        default=True,
+        description="Try a plain HTTP fetch before launching Chrome for simple scrapes",
+    )
+    SCRAPER_PRELOAD: bool = Field(
+        default=False,
+        description="Import all game scraper modules when a worker process starts",
+    )
 
     # ============== Multi-Bot Configuration ==============
     BOTS_CONFIG: str = Field(
@@ -143,6 +179,16 @@ class Settings(BaseSettings):
     
     # Sentry
     SENTRY_DSN: Optional[str] = None
+
+    # Game panel auth tokens captured via browser login
+    TOKEN_TTL_SEC: int = Field(
+        default=1800,
+        description="How long a captured panel auth token is reused before logging in again",
+    )
+    TOKEN_CACHE_DIR: str = Field(
+        default="/tmp/game_tokens",
+        description="Directory where captured panel auth tokens are cached across restarts",
+    )
     
     # Bot Credentials
     PANDAMASTER_USER: Optional[str] = None
@@ -204,6 +250,10 @@ class Settings(BaseSettings):
         """Parse and return list of valid API keys."""
         return [key.strip() for key in self.VALID_API_KEYS.split(",") if key.strip()]
 
+    def get_blocked_url_patterns(self) -> List[str]:
+        """Parse and return list of URL patterns blocked in the browser."""
+        return [p.strip() for p in self.SELENIUM_BLOCKED_URLS.split(",") if p.strip()]
+
     @property
     def telegram_configured(self) -> bool:
         """Check if Telegram is properly configured."""
@@ -1,6 +1,6 @@
 """Services package."""
 # from app.services.database import items_db, users_db # Removed dummy DB services
-from app.services.scraper import selenium_scraper, SeleniumScraper
+from app.services.scraper import selenium_scraper, SeleniumScraper, ScrapeResult
 from app.services.telegram import telegram_service, TelegramService
 from app.services.bot_manager import bot_manager, BotManager, BotConfig, TelegramBotClient
 from app.services.command_handler import command_handler, CommandHandler
@@ -10,6 +10,7 @@ __all__ = [
     # "users_db",
     "selenium_scraper",
     "SeleniumScraper",
+    "ScrapeResult",
     "telegram_service",
     "TelegramService",
     "bot_manager",
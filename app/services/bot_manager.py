@@ -6,19 +6,52 @@ Supports 30+ bots with individual settings.
 import asyncio
 import json
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
 
 from app.core.config import settings
+from app.services import telegram_ratelimit
 
 logger = logging.getLogger(__name__)
 
+# Telegram measures message limits in UTF-16 code units
+MAX_MESSAGE_LENGTH = 4096
+MAX_CAPTION_LENGTH = 1024
 
-@dataclass
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Bot identity rarely changes, so getMe results are reused for an hour
+GET_ME_CACHE_TTL = 3600
+
+# Methods that deliver something to a chat and count against Telegram's limits
+_THROTTLED_METHODS = frozenset({"sendMessage", "sendPhoto", "sendDocument", "sendChatAction"})
+
+# Of those, the ones that count against a group's 20 messages/minute;
+# chat actions aren't messages, so a typing indicator doesn't delay the reply
+_GROUP_THROTTLED_METHODS = _THROTTLED_METHODS - {"sendChatAction"}
+
+
+def truncate_utf16(text: str, limit: int) -> str:
+    """Truncate text to at most `limit` UTF-16 code units."""
+    # Every code point is at most two UTF-16 code units
+    if len(text) * 2 <= limit:
+        return text
+    encoded = text.encode("utf-16-le")
+    if len(encoded) <= limit * 2:
+        return text
+    # Drop a trailing half of a surrogate pair rather than sending it
+    return encoded[:limit * 2].decode("utf-16-le", errors="ignore")
+
+
+@dataclass(slots=True)
 class BotConfig:
     """Configuration for a single Telegram bot."""
     bot_id: str
@@ -64,34 +97,44 @@ class BotConfig:
 class TelegramBotClient:
     """HTTP client for a single Telegram bot."""
     
-    BASE_URL = "https://api.telegram.org/bot{token}/{method}"
+    BASE_URL = "https://api.telegram.org/bot{token}/"
     
-    def __init__(self, config: BotConfig):
+    def __init__(self, config: BotConfig, http_client: httpx.AsyncClient):
+        """
+        Initialize the bot client.
+
+        Args:
+            config: Bot configuration
+            http_client: Shared HTTP client owned by the BotManager
+        """
         self.config = config
-        self._client: Optional[httpx.AsyncClient] = None
-        self._request_times: List[datetime] = []
-    
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
-        return self._client
-    
-    async def close(self):
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        self._client = http_client
+        self._url_prefix = self.BASE_URL.format(token=config.bot_token)
+        self._request_times: deque[float] = deque()
+        self._me_cache: Optional[tuple[float, Dict[str, Any]]] = None
     
     def _get_url(self, method: str) -> str:
         """Build Telegram API URL."""
-        return self.BASE_URL.format(token=self.config.bot_token, method=method)
-    
-    def _check_rate_limit(self) -> bool:
-        """Check if we're within rate limits."""
-        now = datetime.utcnow()
-        # Remove requests older than 1 minute
-        self._request_times = [t for t in self._request_times if (now - t).seconds < 60]
-        return len(self._request_times) < self.config.max_requests_per_minute
+        return self._url_prefix + method
+    
+    def _try_acquire_rate_limit(self, now: Optional[float] = None) -> bool:
+        """Record a request if we're within rate limits."""
+        if now is None:
+            now = time.monotonic()
+        request_times = self._request_times
+        limit = self.config.max_requests_per_minute
+        
+        # The window can only have shrunk, so skip cleanup while under the limit
+        if len(request_times) >= limit:
+            # Remove requests older than 1 minute
+            cutoff = now - 60
+            while request_times and request_times[0] <= cutoff:
+                request_times.popleft()
+            if len(request_times) >= limit:
+                return False
+        
+        request_times.append(now)
+        return True
     
     async def _make_request(
         self,
@@ -100,31 +143,42 @@ class TelegramBotClient:
         files: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Make a request to Telegram API."""
-        if not self._check_rate_limit():
+        if not self._try_acquire_rate_limit():
             logger.warning(f"Rate limit exceeded for bot {self.config.bot_id}")
             return {"ok": False, "error": "Rate limit exceeded"}
         
-        self._request_times.append(datetime.utcnow())
-        client = await self._get_client()
+        if method in _THROTTLED_METHODS:
+            await self._throttle((data or {}).get("chat_id"), per_chat=method in _GROUP_THROTTLED_METHODS)
+        
         url = self._get_url(method)
         
         try:
             if files:
-                response = await client.post(url, data=data, files=files)
+                response = await self._client.post(url, data=data, files=files)
             else:
-                response = await client.post(url, json=data)
-            
-            result = response.json()
+                response = await self._client.post(url, json=data)
             
-            if not result.get("ok"):
-                logger.error(f"Telegram API error for bot {self.config.bot_id}: {result}")
-            
-            return result
+            return self._parse_response(response)
         
         except Exception as e:
             logger.exception(f"Failed to send Telegram request for bot {self.config.bot_id}: {e}")
             return {"ok": False, "error": str(e)}
     
+    async def _throttle(self, chat_id: Optional[str], per_chat: bool = True) -> None:
+        """Wait for the shared bot-wide and (for group messages) per-chat rate limits."""
+        await telegram_ratelimit.acquire(self.config.bot_id)
+        if per_chat and telegram_ratelimit.is_group_chat(chat_id):
+            await telegram_ratelimit.acquire_chat(chat_id)
+    
+    def _parse_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """Decode a Telegram API response and log API errors."""
+        result = response.json()
+        
+        if not result.get("ok"):
+            logger.error(f"Telegram API error for bot {self.config.bot_id}: {result}")
+        
+        return result
+    
     async def send_message(
         self,
         text: str,
@@ -136,7 +190,7 @@ class TelegramBotClient:
         """Send a text message."""
         data = {
             "chat_id": chat_id or self.config.channel_id,
-            "text": text[:4096],
+            "text": truncate_utf16(text, MAX_MESSAGE_LENGTH),
             "parse_mode": parse_mode,
             "disable_notification": disable_notification,
         }
@@ -145,6 +199,63 @@ class TelegramBotClient:
         
         return await self._make_request("sendMessage", data)
     
+    @staticmethod
+    def encode_message(
+        text: str,
+        parse_mode: str = "HTML",
+        disable_notification: bool = False,
+    ) -> bytes:
+        """
+        Pre-encode the chat-independent part of a sendMessage payload.
+
+        The result can be passed to prepare_encoded_message for any number
+        of bots, so a broadcast serializes the message text only once.
+        """
+        body = orjson.dumps({
+            "text": truncate_utf16(text, MAX_MESSAGE_LENGTH),
+            "parse_mode": parse_mode,
+            "disable_notification": disable_notification,
+        })
+        # Strip the opening brace so a chat_id can be spliced in front
+        return body[1:]
+    
+    def prepare_encoded_message(
+        self,
+        encoded: bytes,
+        chat_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Optional[httpx.Request]:
+        """
+        Reserve a rate-limit slot and build (without sending) a sendMessage
+        request from encode_message output.
+
+        Args:
+            encoded: Output of encode_message
+            chat_id: Target chat (defaults to the bot's channel)
+            now: Timestamp to check the rate limit against, shared by a batch
+
+        Returns:
+            The request, or None if the bot is over its per-minute limit
+        """
+        if not self._try_acquire_rate_limit(now):
+            logger.warning(f"Rate limit exceeded for bot {self.config.bot_id}")
+            return None
+        return self._client.build_request(
+            "POST",
+            self._get_url("sendMessage"),
+            content=self._splice_chat_id(encoded, chat_id),
+            headers=_JSON_HEADERS,
+        )
+    
+    async def send_prepared(self, request: httpx.Request, chat_id: Optional[str] = None) -> Dict[str, Any]:
+        """Send a request from prepare_encoded_message once the shared rate limits allow it."""
+        await self._throttle(chat_id or self.config.channel_id)
+        return self._parse_response(await self._client.send(request))
+    
+    def _splice_chat_id(self, encoded: bytes, chat_id: Optional[str]) -> bytes:
+        """Prepend the target chat_id to an encode_message payload."""
+        return b'{"chat_id":' + orjson.dumps(chat_id or self.config.channel_id) + b"," + encoded
+    
     async def send_photo(
         self,
         photo: bytes,
@@ -158,7 +269,7 @@ class TelegramBotClient:
             "parse_mode": "HTML",
         }
         if caption:
-            data["caption"] = caption[:1024]
+            data["caption"] = truncate_utf16(caption, MAX_CAPTION_LENGTH)
         if reply_to_message_id:
             data["reply_to_message_id"] = reply_to_message_id
         
@@ -178,14 +289,20 @@ class TelegramBotClient:
             "parse_mode": "HTML",
         }
         if caption:
-            data["caption"] = caption[:1024]
+            data["caption"] = truncate_utf16(caption, MAX_CAPTION_LENGTH)
         
         files = {"document": (filename, document)}
         return await self._make_request("sendDocument", data, files=files)
     
     async def get_me(self) -> Dict[str, Any]:
-        """Get bot information."""
-        return await self._make_request("getMe")
+        """Get bot information (cached for GET_ME_CACHE_TTL seconds)."""
+        if self._me_cache and time.monotonic() - self._me_cache[0] < GET_ME_CACHE_TTL:
+            return self._me_cache[1]
+        
+        result = await self._make_request("getMe")
+        if result.get("ok"):
+            self._me_cache = (time.monotonic(), result)
+        return result
     
     async def set_webhook(self, url: str, secret_token: Optional[str] = None) -> Dict[str, Any]:
         """Set webhook URL for this bot."""
@@ -251,8 +368,8 @@ class TelegramBotClient:
         
         if data:
             message_parts.append("\n📊 <b>Extracted Data:</b>")
-            for key, value in list(data.items())[:10]:  # Limit to 10 items
-                str_value = str(value)
+            for key, value in islice(data.items(), 10):  # Limit to 10 items
+                str_value = value if isinstance(value, str) else str(value)
                 if len(str_value) > 100:
                     str_value = str_value[:100] + "..."
                 message_parts.append(f"  • <b>{key}:</b> {str_value}")
@@ -285,9 +402,36 @@ class BotManager:
         self._clients: Dict[str, TelegramBotClient] = {}
         self._config_file = Path("/app/data/bots.json")
         self._lock = asyncio.Lock()
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get or create the HTTP client shared by all bots.
+
+        Every bot talks to api.telegram.org, so a single pooled client
+        keeps one set of keep-alive connections instead of one per bot.
+        HTTP/2 lets concurrent requests multiplex over those connections.
+        """
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=90,
+                ),
+            )
+        return self._http
+    
+    def _create_client(self, config: BotConfig) -> TelegramBotClient:
+        """Create a bot client bound to the shared HTTP client."""
+        return TelegramBotClient(config, self._get_http_client())
     
     async def initialize(self):
         """Initialize bot manager and load saved configurations."""
+        self._get_http_client()
+        
         # Load from environment variable if set
         await self._load_from_env()
         
@@ -298,32 +442,7 @@ class BotManager:
     
     async def _load_from_env(self):
         """Load bots from environment variables."""
-        # JSON format: TELEGRAM_BOTS_CONFIG='[{"bot_id": "bot1", "bot_token": "...", ...}]'
-        bots_json = getattr(settings, 'TELEGRAM_BOTS_CONFIG', None)
-        if bots_json:
-            try:
-                bots_data = json.loads(bots_json)
-                for bot_data in bots_data:
-                    await self.register_bot(
-                        bot_id=bot_data["bot_id"],
-                        bot_token=bot_data["bot_token"],
-                        bot_name=bot_data.get("bot_name", bot_data["bot_id"]),
-                        channel_id=bot_data["channel_id"],
-                        allowed_users=bot_data.get("allowed_users", []),
-                        save_to_file=False,
-                    )
-            except Exception as e:
-                logger.error(f"Failed to load bots from env: {e}")
-        
-        # Also support legacy single bot config
-        if settings.TELEGRAM_BOT_TOKEN and settings.TELEGRAM_CHANNEL_ID:
-            await self.register_bot(
-                bot_id="default",
-                bot_token=settings.TELEGRAM_BOT_TOKEN,
-                bot_name="Default Bot",
-                channel_id=settings.TELEGRAM_CHANNEL_ID,
-                save_to_file=False,
-            )
+        self.load_from_env()
     
     async def _load_from_file(self):
         """Load bot configurations from file."""
@@ -404,7 +523,7 @@ class BotManager:
             )
             
             self._bots[bot_id] = config
-            self._clients[bot_id] = TelegramBotClient(config)
+            self._clients[bot_id] = self._create_client(config)
             
             if save_to_file:
                 await self._save_to_file()
@@ -416,10 +535,7 @@ class BotManager:
         """Unregister a bot."""
         async with self._lock:
             if bot_id in self._bots:
-                # Close client
-                if bot_id in self._clients:
-                    await self._clients[bot_id].close()
-                    del self._clients[bot_id]
+                self._clients.pop(bot_id, None)
                 
                 del self._bots[bot_id]
                 await self._save_to_file()
@@ -435,15 +551,16 @@ class BotManager:
                 return None
             
             config = self._bots[bot_id]
+            old_token = config.bot_token
             
             for key, value in kwargs.items():
                 if hasattr(config, key):
                     setattr(config, key, value)
             
-            # Recreate client with new config
-            if bot_id in self._clients:
-                await self._clients[bot_id].close()
-            self._clients[bot_id] = TelegramBotClient(config)
+            # The client only derives its URL from the token; other fields
+            # are read live from the shared config
+            if config.bot_token != old_token or bot_id not in self._clients:
+                self._clients[bot_id] = self._create_client(config)
             
             await self._save_to_file()
             return config
@@ -503,17 +620,32 @@ class BotManager:
         bot_ids: Optional[List[str]] = None,
     ) -> Dict[str, bool]:
         """Send message from multiple bots to their channels."""
-        results = {}
-        
         target_bots = bot_ids or list(self._bots.keys())
+        results = dict.fromkeys(target_bots, False)
+        encoded = TelegramBotClient.encode_message(message)
         
+        # Rate-limit every bot against one timestamp, then fire all
+        # requests concurrently over the shared (HTTP/2) client
+        now = time.monotonic()
+        pending: Dict[str, httpx.Request] = {}
         for bot_id in target_bots:
             client = self._clients.get(bot_id)
-            if client and self._bots[bot_id].is_active:
-                result = await client.send_message(message)
-                results[bot_id] = result.get("ok", False)
-            else:
-                results[bot_id] = False
+            if not client or not self._bots[bot_id].is_active:
+                continue
+            request = client.prepare_encoded_message(encoded, now=now)
+            if request is not None:
+                pending[bot_id] = request
+        
+        responses = await asyncio.gather(
+            *(self._clients[bot_id].send_prepared(request) for bot_id, request in pending.items()),
+            return_exceptions=True,
+        )
+        
+        for bot_id, response in zip(pending, responses, strict=True):
+            if isinstance(response, BaseException):
+                logger.error(f"Failed to broadcast for bot {bot_id}: {response}")
+                continue
+            results[bot_id] = response.get("ok", False)
         
         return results
     
@@ -549,50 +681,61 @@ class BotManager:
         return results
     
     async def close(self):
-        """Close all bot clients."""
-        for client in self._clients.values():
-            await client.close()
+        """Close the shared HTTP client."""
+        if self._http and not self._http.is_closed:
+            await self._http.aclose()
         logger.info("Bot manager closed")
     
     async def close_all(self):
         """Alias for close()."""
         await self.close()
     
+    def _parse_env_bots(self) -> Dict[str, Dict[str, Any]]:
+        """Parse BOTS_CONFIG once, keyed (and deduplicated) by bot_id."""
+        # JSON format: BOTS_CONFIG='[{"bot_id": "bot1", "bot_token": "...", ...}]'
+        bots_json = settings.BOTS_CONFIG
+        if not bots_json:
+            return {}
+        
+        try:
+            return {bot_data["bot_id"]: bot_data for bot_data in orjson.loads(bots_json)}
+        except Exception as e:
+            logger.error(f"Failed to load bots from BOTS_CONFIG: {e}")
+            return {}
+    
     def load_from_env(self) -> int:
         """
         Synchronously load bots from environment variables.
         Returns the number of bots loaded.
         """
-        import json
         count = 0
         
-        # JSON format: BOTS_CONFIG='[{"bot_id": "bot1", "bot_token": "...", ...}]'
-        bots_json = getattr(settings, 'BOTS_CONFIG', None)
-        if bots_json:
+        for bot_id, bot_data in self._parse_env_bots().items():
+            if bot_id in self._bots:
+                continue
             try:
-                bots_data = json.loads(bots_json)
-                for bot_data in bots_data:
-                    config = BotConfig(
-                        bot_id=bot_data["bot_id"],
-                        bot_token=bot_data["bot_token"],
-                        bot_name=bot_data.get("bot_name", bot_data["bot_id"]),
-                        channel_id=bot_data["channel_id"],
-                        allowed_users=bot_data.get("allowed_users", []),
-                        take_screenshot=bot_data.get("take_screenshot", True),
-                        send_to_channel=bot_data.get("send_to_channel", True),
-                        default_wait_time=bot_data.get("default_wait_time", 5),
-                        default_timeout=bot_data.get("default_timeout", 30),
-                    )
-                    self._bots[config.bot_id] = config
-                    self._clients[config.bot_id] = TelegramBotClient(config)
-                    count += 1
-                    logger.info(f"Loaded bot from env: {config.bot_id}")
+                config = BotConfig(
+                    bot_id=bot_id,
+                    bot_token=bot_data["bot_token"],
+                    bot_name=bot_data.get("bot_name", bot_id),
+                    channel_id=bot_data["channel_id"],
+                    allowed_users=bot_data.get("allowed_users", []),
+                    take_screenshot=bot_data.get("take_screenshot", True),
+                    send_to_channel=bot_data.get("send_to_channel", True),
+                    default_wait_time=bot_data.get("default_wait_time", 5),
+                    default_timeout=bot_data.get("default_timeout", 30),
+                )
             except Exception as e:
-                logger.error(f"Failed to load bots from BOTS_CONFIG: {e}")
+                logger.error(f"Invalid bot config for {bot_id}: {e}")
+                continue
+            self._bots[bot_id] = config
+            self._clients[bot_id] = self._create_client(config)
+            count += 1
+            logger.info(f"Loaded bot from env: {bot_id}")
         
         # Also support legacy single bot config
-        telegram_token = getattr(settings, 'TELEGRAM_BOT_TOKEN', None)
-        telegram_channel = getattr(settings, 'TELEGRAM_CHANNEL_ID', None)
+        telegram_token = settings.TELEGRAM_BOT_TOKEN
+        telegram_channel = settings.TELEGRAM_CHANNEL_ID
         
         if telegram_token and telegram_channel and "default" not in self._bots:
             config = BotConfig(
@@ -602,7 +745,7 @@ class BotManager:
                 channel_id=telegram_channel,
             )
             self._bots["default"] = config
-            self._clients["default"] = TelegramBotClient(config)
+            self._clients["default"] = self._create_client(config)
             count += 1
             logger.info("Loaded default bot from TELEGRAM_BOT_TOKEN")
         
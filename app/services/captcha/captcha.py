@@ -1,10 +1,13 @@
 import base64
+import logging
 import os
 import capsolver
 import requests
 import time
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 twocaptcha_api = os.getenv("twocaptcha_api")
 capsolver_api = os.getenv("capsolver_api")
 
@@ -17,7 +20,7 @@ def solving_captcha(driver, wait, img_element):
         result, answer , restart_requiremnent_check= capsolver_request(screenshot_data)
         if not answer:
             result, answer , restart_requiremnent_check = twocaptcha_request(img_element)
-            print(result, answer , restart_requiremnent_check)
+            logger.debug("2captcha result: %s %s %s", result, answer, restart_requiremnent_check)
             if not answer:
                 img_element.click()
                 i+=1
@@ -25,14 +28,13 @@ def solving_captcha(driver, wait, img_element):
                 break
         elif answer == True:
             break 
-    print("0result")
-    print(result," " ,restart_requiremnent_check)
+    logger.debug("Captcha result: %s %s", result, restart_requiremnent_check)
     #os.remove(img_path)
     return result ,restart_requiremnent_check  # if resetart_requiremnet= true must restart tabs
 
 def capsolver_request(screenshot_data):
     capsolver.api_key = capsolver_api
-    print(capsolver_api)
+    logger.debug("Solving captcha with capsolver")
     encoded_string = base64.b64encode(screenshot_data).decode("utf-8")
     result = capsolver.solve({
         "type": "ImageToTextTask",
@@ -46,26 +48,26 @@ def capsolver_request(screenshot_data):
     try:
         ##### second return statement is for unsolvable captcha cuz of distortion
         if (result.get("text") is not None and not result.get("text").isdigit()) or (result.get("answers") is not None and not result.get("answers")[0].isdigit()):
-            print("contains invalid captcha format:", result)
+            logger.warning("Capsolver returned invalid captcha format: %s", result)
             return result, False , True
         elif (result.get("confidence") is not None and result["confidence"] > 0.8) or (result.get("answers") is not None and len(result["answers"][0]) >= 4):  # success
             
             if result.get('text'):
-                print("Success:", result["text"])
+                logger.debug("Capsolver success: %s", result["text"])
                 return result["text"], True , False
             elif result.get('answers'):
-                print("Successss:", result["answers"][0])
+                logger.debug("Capsolver success: %s", result["answers"][0])
                 return result["answers"][0], True , False
         else:  # error
-            print("Error:", result)
+            logger.warning("Capsolver error: %s", result)
             return result, False , False
     except Exception as e:
-        print(e)
+        logger.warning("Capsolver response handling failed: %s", e)
         return result, False , False
     
 def twocaptcha_request(img_element):
     API_KEY = twocaptcha_api
-    print(twocaptcha_api)
+    logger.debug("Solving captcha with 2captcha")
     screenshot_data = img_element.screenshot_as_png
     img_path =  "captcha_screenshot.png"
         
@@ -91,7 +93,7 @@ def twocaptcha_request(img_element):
                 captcha_text = response.text.split('|')[1]
                 break
 
-        print(f'The CAPTCHA text is: {captcha_text}')
+        logger.debug("2captcha text: %s", captcha_text)
     except:
         captcha_text = "error"
     
@@ -103,13 +105,13 @@ def twocaptcha_request(img_element):
     try:
         ##### second return statement is for unsolvable captcha cuz of distortion
         if not captcha_text.isdigit():
-            print("contains invalid captcha format:", captcha_text)
+            logger.warning("2captcha returned invalid captcha format: %s", captcha_text)
             return captcha_text, False , True
         elif captcha_text.isdigit():
-            print("captch sucessfull:", captcha_text)
+            logger.debug("2captcha success: %s", captcha_text)
             return captcha_text, True , False
         else:  # error
-            print("Error:", captcha_text)
+            logger.warning("2captcha error: %s", captcha_text)
             return captcha_text, False , False
     except:
         return captcha_text, False , False
@@ -5,17 +5,45 @@ Processes incoming commands from Telegram bots and executes scraping tasks.
 import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from app.services.bot_manager import BotManager, BotConfig, TelegramBotClient, bot_manager
 from app.services.scraper import selenium_scraper
 
+try:
+    # RE2 matches in linear time, so crafted messages can't trigger backtracking
+    import re2 as url_re
+except ImportError:
+    url_re = re
+
 logger = logging.getLogger(__name__)
 
+# Host characters are spelled out because \w is ASCII-only in RE2 but Unicode
+# in re; the literal U+00A1..U+10FFFF range keeps IDN hosts matching in both
+URL_PATTERN = url_re.compile(r'(?i)https?://[-.%0-9a-z_' '\u00a1-\U0010ffff' r']+\S*')
+
+# Static handler responses, shared read-only instead of rebuilt per update
+_ERR_BOT_NOT_FOUND = MappingProxyType({"ok": False, "error": "Bot not found"})
+_ERR_BOT_INACTIVE = MappingProxyType({"ok": False, "error": "Bot is inactive"})
+_OK_IGNORED_BOT = MappingProxyType({"ok": True, "message": "Ignored bot message"})
+_ERR_USER_NOT_AUTHORIZED = MappingProxyType({"ok": False, "error": "User not authorized"})
+_OK_NO_ACTION = MappingProxyType({"ok": True, "message": "No action taken"})
+_ERR_COMMAND_NOT_ALLOWED = MappingProxyType({"ok": False, "error": "Command not allowed"})
+_ERR_UNKNOWN_COMMAND = MappingProxyType({"ok": False, "error": "Unknown command"})
+_OK_START = MappingProxyType({"ok": True, "command": "start"})
+_OK_HELP = MappingProxyType({"ok": True, "command": "help"})
+_ERR_NO_URL = MappingProxyType({"ok": False, "error": "No URL provided"})
+_ERR_NO_URLS = MappingProxyType({"ok": False, "error": "No URLs provided"})
+_OK_STATUS = MappingProxyType({"ok": True, "command": "status"})
+_OK_CANCELLED = MappingProxyType({"ok": True, "cancelled": True})
+_OK_NOTHING_TO_CANCEL = MappingProxyType({"ok": True, "cancelled": False})
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TelegramUpdate:
     """Parsed Telegram update."""
     update_id: int
@@ -30,6 +58,7 @@ class TelegramUpdate:
     command_args: Optional[str] = None
     is_bot: bool = False
     date: Optional[datetime] = None
+    urls: Tuple[str, ...] = ()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TelegramUpdate":
@@ -45,10 +74,17 @@ class TelegramUpdate:
         command = None
         command_args = None
         if text and text.startswith("/"):
-            parts = text.split(maxsplit=1)
-            cmd = parts[0].split("@")[0]
-            command = cmd[1:]
-            command_args = parts[1] if len(parts) > 1 else None
+            head, _, rest = text.partition(" ")
+            if not head.isprintable():
+                # Arguments separated by a newline or tab rather than a space
+                parts = text.split(maxsplit=1)
+                head = parts[0]
+                rest = parts[1] if len(parts) > 1 else ""
+            at = head.find("@")
+            command = head[1:at] if at != -1 else head[1:]
+            command_args = rest.lstrip() or None
+        
+        date = message.get("date")
         
         return cls(
             update_id=update_id,
@@ -62,7 +98,9 @@ class TelegramUpdate:
             command=command,
             command_args=command_args,
             is_bot=user.get("is_bot", False),
-            date=datetime.fromtimestamp(message.get("date", 0)) if message.get("date") else None,
+            date=datetime.fromtimestamp(date) if date else None,
+            # Scanned once here; command arguments are part of the text
+            urls=tuple(URL_PATTERN.findall(text)) if text else (),
         )
 
 
@@ -77,61 +115,90 @@ class CommandHandler:
     - /help - Show help message
     """
     
-    URL_PATTERN = re.compile(
-        r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[^\s]*',
-        re.IGNORECASE
-    )
+    URL_PATTERN = URL_PATTERN
+    WAIT_PATTERN = re.compile(r'wait=(\d+)', re.IGNORECASE)
+    NOSCREEN_PATTERN = re.compile(r'noscreen', re.IGNORECASE)
+    
+    # Commands dispatched to the matching _cmd_<name> method
+    COMMANDS = frozenset({"start", "help", "scrape", "batch", "status", "cancel"})
+    
+    # Authorization results are reused for this many seconds
+    ALLOWED_CACHE_TTL = 60
+    ALLOWED_CACHE_MAX_SIZE = 10000
     
     def __init__(self, manager: BotManager):
         self.bot_manager = manager
         self._scraping_tasks: Dict[str, asyncio.Task] = {}
+        self._allowed_cache: Dict[Tuple[str, Optional[int]], Tuple[float, bool]] = {}
+    
+    def _is_user_allowed(self, bot_id: str, user_id: Optional[int]) -> bool:
+        """Check the bot's allow-list through a short-lived cache."""
+        key = (bot_id, user_id)
+        now = time.monotonic()
+        cached = self._allowed_cache.get(key)
+        if cached and now - cached[0] < self.ALLOWED_CACHE_TTL:
+            return cached[1]
+        
+        allowed = self.bot_manager.is_user_allowed(bot_id, user_id)
+        if len(self._allowed_cache) >= self.ALLOWED_CACHE_MAX_SIZE:
+            self._allowed_cache.clear()
+        self._allowed_cache[key] = (now, allowed)
+        return allowed
+    
+    def invalidate_user(self, bot_id: str, user_id: Optional[int] = None) -> None:
+        """Drop cached authorization for one user, or for every user of a bot."""
+        if user_id is not None:
+            self._allowed_cache.pop((bot_id, user_id), None)
+            return
+        for key in [k for k in self._allowed_cache if k[0] == bot_id]:
+            del self._allowed_cache[key]
     
     async def handle_update(
         self,
         bot_id: str,
         update_data: Dict[str, Any],
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle incoming Telegram update."""
         bot = self.bot_manager.get_bot(bot_id)
         client = self.bot_manager.get_client(bot_id)
         
         if not bot or not client:
             logger.error(f"Bot not found: {bot_id}")
-            return {"ok": False, "error": "Bot not found"}
+            return _ERR_BOT_NOT_FOUND
         
         if not bot.is_active:
             logger.warning(f"Bot is inactive: {bot_id}")
-            return {"ok": False, "error": "Bot is inactive"}
+            return _ERR_BOT_INACTIVE
         
         update = TelegramUpdate.from_dict(update_data)
         
         if update.is_bot:
-            return {"ok": True, "message": "Ignored bot message"}
+            return _OK_IGNORED_BOT
         
-        if not self.bot_manager.is_user_allowed(bot_id, update.user_id):
+        if not self._is_user_allowed(bot_id, update.user_id):
             logger.warning(f"User {update.user_id} not allowed for bot {bot_id}")
             await client.send_message(
                 "⛔ You are not authorized to use this bot.",
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
             )
-            return {"ok": False, "error": "User not authorized"}
+            return _ERR_USER_NOT_AUTHORIZED
         
         if update.command:
             return await self._handle_command(bot, client, update)
         
-        urls = self.URL_PATTERN.findall(update.text or "")
+        urls = update.urls
         if urls:
             return await self._handle_auto_scrape(bot, client, update, urls)
         
-        return {"ok": True, "message": "No action taken"}
+        return _OK_NO_ACTION
     
     async def _handle_command(
         self,
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle a bot command."""
         command = update.command.lower()
         
@@ -141,19 +208,10 @@ class CommandHandler:
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
             )
-            return {"ok": False, "error": "Command not allowed"}
-        
-        handlers = {
-            "start": self._cmd_start,
-            "help": self._cmd_help,
-            "scrape": self._cmd_scrape,
-            "batch": self._cmd_batch,
-            "status": self._cmd_status,
-            "cancel": self._cmd_cancel,
-        }
+            return _ERR_COMMAND_NOT_ALLOWED
         
-        handler = handlers.get(command)
-        if handler:
+        if command in self.COMMANDS:
+            handler = getattr(self, f"_cmd_{command}")
             return await handler(bot, client, update)
         
         await client.send_message(
@@ -161,14 +219,14 @@ class CommandHandler:
             chat_id=str(update.chat_id),
             reply_to_message_id=update.message_id,
         )
-        return {"ok": False, "error": "Unknown command"}
+        return _ERR_UNKNOWN_COMMAND
     
     async def _cmd_start(
         self,
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle /start command."""
         message = (
             f"👋 <b>Welcome to {bot.bot_name}!</b>\n\n"
@@ -185,14 +243,14 @@ class CommandHandler:
             chat_id=str(update.chat_id),
             reply_to_message_id=update.message_id,
         )
-        return {"ok": True, "command": "start"}
+        return _OK_START
     
     async def _cmd_help(
         self,
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle /help command."""
         message = (
             f"📖 <b>{bot.bot_name} Commands</b>\n\n"
@@ -211,18 +269,18 @@ class CommandHandler:
             chat_id=str(update.chat_id),
             reply_to_message_id=update.message_id,
         )
-        return {"ok": True, "command": "help"}
+        return _OK_HELP
     
     async def _cmd_scrape(
         self,
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle /scrape command."""
         args = update.command_args or ""
         
-        urls = self.URL_PATTERN.findall(args)
+        urls = update.urls
         if not urls:
             await client.send_message(
                 "⚠️ Please provide a URL.\n\n"
@@ -230,7 +288,7 @@ class CommandHandler:
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
             )
-            return {"ok": False, "error": "No URL provided"}
+            return _ERR_NO_URL
         
         url = urls[0]
         options = self._parse_scrape_options(args, bot)
@@ -246,16 +304,18 @@ class CommandHandler:
             result = await selenium_scraper.scrape(
                 url=url,
                 wait_time=options.get("wait_time"),
+                fallback_wait_time=bot.default_wait_time,
                 take_screenshot=options.get("take_screenshot", True),
+                include_html=False,
             )
             
             # Send to user
             await client.send_scrape_result(
-                url=result["url"],
-                title=result.get("title"),
-                data=result.get("data", {}),
-                screenshot=result.get("screenshot") if options.get("take_screenshot") else None,
-                error=result.get("error"),
+                url=result.url,
+                title=result.title,
+                data=result.data,
+                screenshot=result.screenshot if options.get("take_screenshot") else None,
+                error=result.error,
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
                 source="telegram",
@@ -264,11 +324,11 @@ class CommandHandler:
             # Send to channel
             if bot.send_to_channel and str(update.chat_id) != bot.channel_id:
                 await client.send_scrape_result(
-                    url=result["url"],
-                    title=result.get("title"),
-                    data=result.get("data", {}),
-                    screenshot=result.get("screenshot") if options.get("take_screenshot") else None,
-                    error=result.get("error"),
+                    url=result.url,
+                    title=result.title,
+                    data=result.data,
+                    screenshot=result.screenshot if options.get("take_screenshot") else None,
+                    error=result.error,
                     source=f"telegram (@{update.username or update.user_id})",
                 )
             
@@ -288,11 +348,9 @@ class CommandHandler:
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle /batch command."""
-        args = update.command_args or ""
-        
-        urls = self.URL_PATTERN.findall(args)
+        urls = update.urls
         if not urls:
             await client.send_message(
                 "⚠️ Please provide URLs.\n\n"
@@ -300,7 +358,7 @@ class CommandHandler:
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
             )
-            return {"ok": False, "error": "No URLs provided"}
+            return _ERR_NO_URLS
         
         max_urls = 10
         if len(urls) > max_urls:
@@ -313,9 +371,9 @@ class CommandHandler:
             reply_to_message_id=update.message_id,
         )
         
-        results = await selenium_scraper.scrape_multiple(urls=urls, take_screenshot=False)
+        results = await selenium_scraper.scrape_multiple(urls=list(urls), take_screenshot=False, include_html=False)
         
-        successful = sum(1 for r in results if r.get("success"))
+        successful = sum(1 for r in results if r.success)
         failed = len(results) - successful
         
         summary = (
@@ -324,11 +382,10 @@ class CommandHandler:
             f"❌ Failed: {failed}\n"
             f"📈 Total: {len(results)}\n\n"
         )
-        
-        for i, result in enumerate(results, 1):
-            status = "✅" if result.get("success") else "❌"
-            title = (result.get("title") or "No title")[:25]
-            summary += f"{i}. {status} {title}\n"
+        summary += "".join(
+            f"{i}. {'✅' if result.success else '❌'} {(result.title or 'No title')[:25]}\n"
+            for i, result in enumerate(results, 1)
+        )
         
         await client.send_message(summary, chat_id=str(update.chat_id))
         
@@ -345,7 +402,7 @@ class CommandHandler:
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle /status command."""
         bot_info = await client.get_me()
         bot_username = bot_info.get("result", {}).get("username", "Unknown")
@@ -365,14 +422,14 @@ class CommandHandler:
             chat_id=str(update.chat_id),
             reply_to_message_id=update.message_id,
         )
-        return {"ok": True, "command": "status"}
+        return _OK_STATUS
     
     async def _cmd_cancel(
         self,
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Handle /cancel command."""
         task_key = f"{bot.bot_id}:{update.user_id}"
         
@@ -385,22 +442,22 @@ class CommandHandler:
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
             )
-            return {"ok": True, "cancelled": True}
+            return _OK_CANCELLED
         
         await client.send_message(
             "ℹ️ No active task.",
             chat_id=str(update.chat_id),
             reply_to_message_id=update.message_id,
         )
-        return {"ok": True, "cancelled": False}
+        return _OK_NOTHING_TO_CANCEL
     
     async def _handle_auto_scrape(
         self,
         bot: BotConfig,
         client: TelegramBotClient,
         update: TelegramUpdate,
-        urls: List[str],
-    ) -> Dict[str, Any]:
+        urls: Tuple[str, ...],
+    ) -> Mapping[str, Any]:
         """Auto-scrape URLs sent without command."""
         url = urls[0]
         
@@ -410,15 +467,16 @@ class CommandHandler:
             result = await selenium_scraper.scrape(
                 url=url,
                 take_screenshot=bot.take_screenshot,
-                wait_time=bot.default_wait_time,
+                fallback_wait_time=bot.default_wait_time,
+                include_html=False,
             )
             
             await client.send_scrape_result(
-                url=result["url"],
-                title=result.get("title"),
-                data=result.get("data", {}),
-                screenshot=result.get("screenshot") if bot.take_screenshot else None,
-                error=result.get("error"),
+                url=result.url,
+                title=result.title,
+                data=result.data,
+                screenshot=result.screenshot if bot.take_screenshot else None,
+                error=result.error,
                 chat_id=str(update.chat_id),
                 reply_to_message_id=update.message_id,
                 source="telegram (auto)",
@@ -426,11 +484,11 @@ class CommandHandler:
             
             if bot.send_to_channel and str(update.chat_id) != bot.channel_id:
                 await client.send_scrape_result(
-                    url=result["url"],
-                    title=result.get("title"),
-                    data=result.get("data", {}),
-                    screenshot=result.get("screenshot") if bot.take_screenshot else None,
-                    error=result.get("error"),
+                    url=result.url,
+                    title=result.title,
+                    data=result.data,
+                    screenshot=result.screenshot if bot.take_screenshot else None,
+                    error=result.error,
                     source=f"telegram (@{update.username or update.user_id})",
                 )
             
@@ -442,17 +500,18 @@ class CommandHandler:
     
     def _parse_scrape_options(self, args: str, bot: BotConfig) -> Dict[str, Any]:
         """Parse options from command arguments."""
+        # Only an explicit wait= forces the browser; the bot default is a fallback
         options = {
-            "wait_time": bot.default_wait_time,
+            "wait_time": None,
             "timeout": bot.default_timeout,
             "take_screenshot": bot.take_screenshot,
         }
         
-        wait_match = re.search(r'wait=(\d+)', args, re.IGNORECASE)
+        wait_match = self.WAIT_PATTERN.search(args)
         if wait_match:
             options["wait_time"] = min(int(wait_match.group(1)), 30)
         
-        if "noscreen" in args.lower():
+        if self.NOSCREEN_PATTERN.search(args):
             options["take_screenshot"] = False
         
         return options
@@ -1,11 +1,54 @@
 import asyncio
 import datetime
-import os
 import io
-from time import sleep
+import logging
+import threading
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app.services import telegram_ratelimit
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the group rate-limit wait plus the upload, in seconds
+RECEIPT_SEND_TIMEOUT = 30
+
+# Long-lived event loop for sending receipts from synchronous scraper code.
+# Reusing one loop keeps the bot's HTTP connection pool alive between calls
+# instead of building and tearing down a loop per receipt with asyncio.run().
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop thread."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                name="receipt-loop",
+                daemon=True,
+            ).start()
+        return _background_loop
+
+
+async def _send_receipt(recharge_bot, chat_id, photo, reply_to_message_id):
+    """Send the receipt photo once the group's rate limit allows it."""
+    await telegram_ratelimit.acquire_chat(chat_id)
+    return await recharge_bot.send_photo(
+        chat_id=chat_id,
+        photo=photo,
+        reply_to_message_id=reply_to_message_id
+    )
+
 
 def save_receipt(driver, player_ID, recharge_redeem_amount, recharge_bot, receipt_group_ids, receipt_topic_id):
-    sleep(1.5)  # Ensure the UI is fully loaded before taking screenshot
+    # Ensure the UI is fully loaded before taking screenshot
+    WebDriverWait(driver, 5).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
     tele_url = f"https://t.me/c/{str(receipt_group_ids)[4:]}/"
     # Generate unique file name
     now = datetime.datetime.now()
@@ -19,18 +62,22 @@ def save_receipt(driver, player_ID, recharge_redeem_amount, recharge_bot, receip
     screenshot_stream.seek(0)
 
     message_url_link = ""
+    future = None
     try:
         # Send screenshot as photo
-        receipt = asyncio.run(recharge_bot.send_photo(
-            chat_id=int(receipt_group_ids),
-            photo=screenshot_stream,
-            reply_to_message_id=receipt_topic_id
-        ))
+        future = asyncio.run_coroutine_threadsafe(
+            _send_receipt(recharge_bot, int(receipt_group_ids), screenshot_stream, receipt_topic_id),
+            _get_background_loop(),
+        )
+        receipt = future.result(timeout=RECEIPT_SEND_TIMEOUT)
         receipt_id = receipt.message_id
         message_url_link = f"{tele_url}{receipt_topic_id}/{receipt_id}"
-        print("Sent photo to group:", message_url_link)
+        logger.info("Sent receipt to group: %s", message_url_link)
 
     except Exception as e:
-        print("Sending image failed:", e)
+        # Stop a send still waiting on the rate limit; a late photo would have no link
+        if future is not None:
+            future.cancel()
+        logger.error("Sending receipt failed: %s", str(e) or type(e).__name__)
 
     return message_url_link
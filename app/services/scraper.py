@@ -3,16 +3,28 @@ Selenium Web Scraping Service.
 Provides browser automation for scraping dynamic websites.
 """
 import asyncio
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
+import shutil
 import tempfile
+from collections import namedtuple
 from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
-from concurrent.futures import ThreadPoolExecutor
-
-from bs4 import BeautifulSoup
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import lxml.html
+import requests
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -23,16 +35,156 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import (
     TimeoutException,
     WebDriverException,
-    NoSuchElementException,
 )
 
 from app.core.config import settings
+from app.services.scrapers.driver_pool import WebDriverPool
 
 logger = logging.getLogger(__name__)
 
-# Thread pool for running Selenium in async context
+# Thread pool for blocking work that must stay in this process
+# (static fetches, get_driver, rules with non-picklable transforms)
 _executor = ThreadPoolExecutor(max_workers=4)
 
+# Writes screenshot copies to disk off the scrape path
+_screenshot_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ss-writer")
+
+# Process pool for browser scrapes, created on first use. Each worker keeps
+# its own warm driver, so a crashed browser only takes down one worker.
+_process_executor: Optional[ProcessPoolExecutor] = None
+
+# Shared HTTP session for the static (browser-less) fast path
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+
+# Pages with less visible text than this are assumed to be rendered by JS
+STATIC_MIN_TEXT_LENGTH = 200
+
+# Empty app-shell mount points left behind by client-side frameworks
+JS_SHELL_SELECTOR = "#root:empty, #app:empty, #__next:empty, [ng-app], [data-js-required]"
+
+# Resource types blocked through CDP to skip download, decode and paint work
+IMAGE_URL_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico")
+FONT_URL_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot")
+CSS_URL_PATTERNS = ("*.css",)
+
+# Image-like attributes that need image URLs to stay loadable
+IMAGE_ATTRIBUTES = frozenset({"src", "srcset", "currentSrc"})
+
+# Resolves once the page has loaded and no new resources have started for
+# `idle` ms, or after `timeout` ms, whichever comes first
+WAIT_FOR_IDLE_JS = """
+const [idle, timeout, done] = arguments;
+const started = Date.now();
+let count = -1, stableSince = Date.now();
+(function poll() {
+    const now = Date.now();
+    const current = performance.getEntriesByType('resource').length;
+    if (current !== count || document.readyState !== 'complete') {
+        count = current;
+        stableSince = now;
+    }
+    if (now - stableSince >= idle || now - started >= timeout) {
+        done(now - started);
+    } else {
+        setTimeout(poll, 100);
+    }
+})();
+"""
+
+# Scrolls until the page height stops growing, entirely inside the browser
+SCROLL_TO_BOTTOM_JS = """
+const [pause, maxRounds, done] = arguments;
+let last = document.body.scrollHeight, rounds = 0;
+(function step() {
+    window.scrollTo(0, document.body.scrollHeight);
+    setTimeout(() => {
+        const height = document.body.scrollHeight;
+        if (height === last || ++rounds >= maxRounds) {
+            done(height);
+        } else {
+            last = height;
+            step();
+        }
+    }, pause);
+})();
+"""
+
+# Removes the navigator.webdriver flag before any page script runs
+STEALTH_JS = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+
+# Network quiet period treated as "finished loading", in milliseconds
+NETWORK_IDLE_MS = 500
+
+@dataclass(slots=True)
+class ScrapeResult:
+    """Outcome of scraping a single URL."""
+    url: str
+    success: bool = False
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    title: Optional[str] = None
+    html: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    screenshot: Optional[bytes] = None
+    screenshot_path: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (the pre-dataclass result format)."""
+        return asdict(self)
+
+
+# Extraction rule resolved once per scrape() call instead of per page/field
+RulePlan = namedtuple("RulePlan", "field selector attribute get_value multiple transform")
+
+
+@lru_cache(maxsize=512)
+def _compile_selector(selector: str) -> CSSSelector:
+    """Translate a CSS selector to XPath once per process."""
+    return CSSSelector(selector)
+
+
+def _lxml_text(element) -> str:
+    """Text content of an element."""
+    return element.text_content().strip()
+
+
+# Text nodes a browser would render: skips script/style source and inert markup
+_VISIBLE_TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::noscript or ancestor::template)]"
+)
+
+
+def _visible_text_nodes(element) -> List[str]:
+    """Rendered text nodes under an element, in document order."""
+    return _VISIBLE_TEXT_XPATH(element)
+
+
+def _lxml_inner_html(element) -> str:
+    """Markup inside an element (innerHTML)."""
+    return (element.text or "") + "".join(
+        etree.tostring(child, encoding="unicode") for child in element
+    )
+
+
+def _lxml_outer_html(element) -> str:
+    """Markup of the element itself (outerHTML)."""
+    return etree.tostring(element, encoding="unicode", with_tail=False)
+
+
+def _lxml_attribute(name: str, element) -> Optional[str]:
+    """Value of a named attribute."""
+    return element.get(name)
+
+
+_LXML_GETTERS = {
+    "text": _lxml_text,
+    "html": _lxml_inner_html,
+    "outer_html": _lxml_outer_html,
+}
+
 
 class SeleniumScraper:
     """
@@ -45,6 +197,10 @@ class SeleniumScraper:
         headless: bool = None,
         timeout: int = None,
         user_agent: str = None,
+        disable_images: bool = None,
+        disable_css: bool = None,
+        block_urls: Optional[List[str]] = None,
+        pool_size: Optional[int] = None,
     ):
         """
         Initialize the scraper.
@@ -53,19 +209,46 @@ class SeleniumScraper:
             headless: Run in headless mode
             timeout: Default timeout for operations
             user_agent: Custom user agent string
+            disable_images: Block images when not needed for the scrape
+            disable_css: Block stylesheets
+            block_urls: URL patterns (e.g. analytics/ads) to never load
+            pool_size: Maximum warm browsers (defaults to this process's
+                share of SELENIUM_POOL_SIZE)
         """
         self.headless = headless if headless is not None else settings.SELENIUM_HEADLESS
         self.timeout = timeout or settings.SELENIUM_TIMEOUT
         self.user_agent = user_agent or settings.SELENIUM_USER_AGENT
+        self.disable_images = disable_images if disable_images is not None else settings.SELENIUM_DISABLE_IMAGES
+        self.disable_css = disable_css if disable_css is not None else settings.SELENIUM_DISABLE_CSS
+        self.block_urls = tuple(block_urls if block_urls is not None else settings.get_blocked_url_patterns())
         self.page_load_timeout = settings.SELENIUM_PAGE_LOAD_TIMEOUT
         self.implicit_wait = settings.SELENIUM_IMPLICIT_WAIT
         self.screenshots_dir = Path(settings.SCREENSHOTS_DIR)
+        self.pool_size = pool_size or _split_browser_budget()[1]
 
         # Ensure screenshots directory exists
         self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
-    def _create_driver(self) -> WebDriver:
-        """Create and configure a Chrome WebDriver instance."""
+        # One persistent Chrome profile per pool slot, so HTTP/DNS/code caches
+        # survive driver restarts. Chrome locks a profile while running, so
+        # each live driver needs its own directory.
+        self.profiles_root = Path(tempfile.mkdtemp(prefix=f"chrome-profiles-{os.getpid()}-"))
+        self._free_profiles: "queue.SimpleQueue[Path]" = queue.SimpleQueue()
+        for slot in range(self.pool_size):
+            self._free_profiles.put(self.profiles_root / f"slot-{slot}")
+        self._driver_profiles: Dict[int, Path] = {}
+        atexit.register(shutil.rmtree, self.profiles_root, ignore_errors=True)
+
+        # Reuse warm browsers across scrapes instead of launching one per URL
+        self.pool = WebDriverPool(
+            self._create_driver,
+            max_drivers=self.pool_size,
+            on_quit=self._release_profile,
+        )
+        atexit.register(self.pool.shutdown)
+
+    def build_chrome_options(self) -> ChromeOptions:
+        """Build the standard Chrome options (without a profile directory)."""
         chrome_options = ChromeOptions()
 
         # Headless mode
@@ -101,6 +284,9 @@ class SeleniumScraper:
         # Experimental options
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option("useAutomationExtension", False)
+        chrome_options.add_experimental_option("prefs", {
+            "profile.default_content_setting_values.notifications": 2,
+        })
 
         # Set binary location if specified
         if settings.CHROME_BINARY_PATH:
@@ -108,6 +294,15 @@ class SeleniumScraper:
         elif os.path.exists("/usr/bin/chromium"):
             chrome_options.binary_location = "/usr/bin/chromium"
 
+        return chrome_options
+
+    def launch_chrome(self, chrome_options: ChromeOptions) -> WebDriver:
+        """
+        Start Chrome with the given options and apply stealth patches.
+
+        Args:
+            chrome_options: Options, usually from build_chrome_options()
+        """
         # Create service
         service = None
         if settings.CHROMEDRIVER_PATH:
@@ -125,38 +320,68 @@ class SeleniumScraper:
             logger.error(f"Failed to create Chrome driver: {e}")
             raise
 
+        # Hide the automation markers the launch flags can't remove
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": STEALTH_JS})
+            driver.execute_cdp_cmd("Network.setUserAgentOverride", {
+                "userAgent": self.user_agent,
+                "platform": "Win32",
+            })
+        except Exception as e:
+            logger.debug(f"Could not apply stealth patches: {e}")
+
         # Configure timeouts
         driver.set_page_load_timeout(self.page_load_timeout)
         driver.implicitly_wait(self.implicit_wait)
 
         return driver
 
+    def _create_driver(self) -> WebDriver:
+        """Create a pooled Chrome WebDriver with its own persistent profile."""
+        chrome_options = self.build_chrome_options()
+
+        # Persistent profile and disk cache
+        profile_dir = self._free_profiles.get_nowait()
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        chrome_options.add_argument(f"--disk-cache-dir={profile_dir / 'cache'}")
+        chrome_options.add_argument("--disk-cache-size=268435456")
+
+        try:
+            driver = self.launch_chrome(chrome_options)
+        except Exception:
+            self._free_profiles.put(profile_dir)
+            raise
+        self._driver_profiles[id(driver)] = profile_dir
+        return driver
+
+    def _release_profile(self, driver: WebDriver):
+        """Make a quit driver's profile directory available again."""
+        profile_dir = self._driver_profiles.pop(id(driver), None)
+        if profile_dir is not None:
+            self._free_profiles.put(profile_dir)
+
     @asynccontextmanager
     async def get_driver(self):
         """Async context manager for WebDriver."""
-        driver = None
+        loop = asyncio.get_event_loop()
+        driver = await loop.run_in_executor(_executor, self.pool.acquire)
         try:
-            driver = await asyncio.get_event_loop().run_in_executor(
-                _executor, self._create_driver
-            )
             yield driver
         finally:
-            if driver:
-                await asyncio.get_event_loop().run_in_executor(
-                    _executor, driver.quit
-                )
+            await loop.run_in_executor(_executor, self.pool.release, driver)
 
     def _scrape_sync(
         self,
         url: str,
         wait_for: Optional[str] = None,
         wait_type: str = "presence",
-        extract_rules: Optional[Dict[str, Dict]] = None,
+        rule_plans: Optional[List[RulePlan]] = None,
         take_screenshot: bool = False,
         scroll_to_bottom: bool = False,
         wait_time: int = None,
         custom_js: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        include_html: bool = True,
+    ) -> ScrapeResult:
         """
         Synchronous scraping method.
 
@@ -164,28 +389,25 @@ class SeleniumScraper:
             url: URL to scrape
             wait_for: CSS selector to wait for
             wait_type: Type of wait (presence, visibility, clickable)
-            extract_rules: Rules for data extraction
+            rule_plans: Extraction rules from _build_rule_plans()
             take_screenshot: Capture screenshot
             scroll_to_bottom: Scroll to bottom of page
             wait_time: Additional wait time after page load
             custom_js: Custom JavaScript to execute
+            include_html: Return the page HTML in the result
 
         Returns:
-            Dictionary with scraped data
+            Scrape result
         """
-        driver = self._create_driver()
-        result = {
-            "url": url,
-            "success": False,
-            "timestamp": datetime.utcnow().isoformat(),
-            "title": None,
-            "html": None,
-            "data": {},
-            "screenshot": None,
-            "error": None,
-        }
+        driver = self.pool.acquire()
+        broken = False
+        result = ScrapeResult(url=url)
 
         try:
+            # Pooled drivers are shared, so blocking is set per scrape
+            keep_images = take_screenshot or self._rules_need_images(rule_plans)
+            self._apply_url_blocking(driver, keep_images)
+
             # Navigate to URL
             logger.info(f"Navigating to: {url}")
             driver.get(url)
@@ -201,10 +423,9 @@ class SeleniumScraper:
                 condition = wait_conditions.get(wait_type, EC.presence_of_element_located)
                 wait.until(condition((By.CSS_SELECTOR, wait_for)))
 
-            # Additional wait time
+            # Wait for the network to go quiet, with wait_time as the upper bound
             if wait_time:
-                import time
-                time.sleep(wait_time)
+                self._wait_for_idle(driver, wait_time)
 
             # Scroll to bottom if requested
             if scroll_to_bottom:
@@ -214,105 +435,240 @@ class SeleniumScraper:
             if custom_js:
                 driver.execute_script(custom_js)
 
-            # Get page info
-            result["title"] = driver.title
-            result["html"] = driver.page_source
+            # Get page info; the DOM is serialized once (only if someone needs
+            # it) and parsed locally instead of one round trip per field
+            result.title = driver.title
+            if include_html or rule_plans:
+                html = driver.execute_script("return document.documentElement.outerHTML")
+                if include_html:
+                    result.html = html
 
-            # Extract data based on rules
-            if extract_rules:
-                result["data"] = self._extract_data(driver, extract_rules)
+                # Extract data based on rules
+                if rule_plans:
+                    tree = self._parse_html(html, base_url=driver.current_url)
+                    result.data = self._extract_data_local(tree, rule_plans)
 
             # Take screenshot
             if take_screenshot:
-                screenshot_path = self.screenshots_dir / f"screenshot_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
-                driver.save_screenshot(str(screenshot_path))
-                with open(screenshot_path, "rb") as f:
-                    result["screenshot"] = f.read()
-                result["screenshot_path"] = str(screenshot_path)
+                screenshot_path = self.screenshots_dir / f"screenshot_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}.png"
+                result.screenshot = driver.get_screenshot_as_png()
+                result.screenshot_path = str(screenshot_path)
+                # The bytes are already in hand; saving a copy needn't block the scrape
+                _screenshot_writer.submit(screenshot_path.write_bytes, result.screenshot)
 
-            result["success"] = True
+            result.success = True
             logger.info(f"Successfully scraped: {url}")
 
         except TimeoutException as e:
-            result["error"] = f"Timeout waiting for page element: {str(e)}"
-            logger.error(result["error"])
+            result.error = f"Timeout waiting for page element: {str(e)}"
+            logger.error(result.error)
 
         except WebDriverException as e:
-            result["error"] = f"WebDriver error: {str(e)}"
-            logger.error(result["error"])
+            result.error = f"WebDriver error: {str(e)}"
+            logger.error(result.error)
+            broken = True
 
         except Exception as e:
-            result["error"] = f"Unexpected error: {str(e)}"
-            logger.exception(result["error"])
+            result.error = f"Unexpected error: {str(e)}"
+            logger.exception(result.error)
+            broken = True
 
         finally:
-            driver.quit()
+            self.pool.release(driver, discard=broken)
 
         return result
 
-    def _scroll_to_bottom(self, driver: WebDriver, pause_time: float = 0.5):
-        """Scroll to the bottom of the page to load lazy content."""
-        import time
+    def _rules_need_images(self, rule_plans: Optional[List[RulePlan]]) -> bool:
+        """Check whether any extraction rule reads an image attribute."""
+        return bool(rule_plans) and any(
+            plan.attribute in IMAGE_ATTRIBUTES for plan in rule_plans
+        )
+
+    def _apply_url_blocking(self, driver: WebDriver, keep_images: bool = False):
+        """Block ads and optionally images, fonts and CSS via the DevTools protocol."""
+        patterns = list(self.block_urls)
+        if self.disable_images and not keep_images:
+            patterns.extend(IMAGE_URL_PATTERNS)
+            patterns.extend(FONT_URL_PATTERNS)
+        if self.disable_css:
+            patterns.extend(CSS_URL_PATTERNS)
+
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.debug(f"Could not set blocked URLs: {e}")
+
+    def _can_use_static(
+        self,
+        url: str,
+        wait_for: Optional[str] = None,
+        scroll_to_bottom: bool = False,
+        custom_js: Optional[str] = None,
+        take_screenshot: bool = False,
+        wait_time: Optional[int] = None,
+    ) -> bool:
+        """
+        Check whether a scrape can skip the browser entirely.
+
+        A wait_time asks for time to let the page settle, which only means
+        something in a browser, so it counts as a browser-only option.
+        """
+        return (
+            settings.SCRAPER_STATIC_FIRST
+            and url.startswith(("http://", "https://"))
+            and not (wait_for or scroll_to_bottom or custom_js or take_screenshot or wait_time)
+        )
+
+    def _fetch_static(self, url: str):
+        """
+        Fetch and parse a page without a browser.
+
+        Returns:
+            (response, parsed tree), or None if the page needs a browser
+        """
+        try:
+            response = _http_session.get(
+                url,
+                headers={"User-Agent": self.user_agent},
+                timeout=self.page_load_timeout,
+            )
+        except requests.RequestException as e:
+            logger.info(f"Static fetch failed for {url}, falling back to browser: {e}")
+            return None
 
-        last_height = driver.execute_script("return document.body.scrollHeight")
+        content_type = response.headers.get("Content-Type", "")
+        if not response.ok or "html" not in content_type:
+            logger.info(f"Static fetch unusable for {url} ({response.status_code}, {content_type})")
+            return None
 
-        while True:
-            # Scroll down
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause_time)
+        tree = self._parse_html(response.content, base_url=response.url)
+        if tree is None or self._needs_js_rendering(tree):
+            logger.info(f"Page requires JavaScript rendering: {url}")
+            return None
 
-            # Check new height
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+        return response, tree
 
-    def _extract_data(
+    def _scrape_static(
         self,
-        driver: WebDriver,
-        rules: Dict[str, Dict],
-    ) -> Dict[str, Any]:
+        url: str,
+        rule_plans: Optional[List[RulePlan]] = None,
+        include_html: bool = True,
+    ) -> Optional[ScrapeResult]:
+        """
+        Scrape a page with a plain HTTP GET and lxml.
+
+        Args:
+            url: URL to scrape
+            rule_plans: Extraction rules from _build_rule_plans()
+            include_html: Return the page HTML in the result
+
+        Returns:
+            Scrape result, or None if the page needs a browser
         """
-        Extract data from page based on rules.
+        fetched = self._fetch_static(url)
+        if fetched is None:
+            return None
+        response, tree = fetched
+
+        result = ScrapeResult(
+            url=url,
+            success=True,
+            title=(tree.findtext(".//title") or "").strip(),
+            html=response.text if include_html else None,
+        )
+        if rule_plans:
+            result.data = self._extract_data_local(tree, rule_plans)
+
+        logger.info(f"Successfully scraped (static): {url}")
+        return result
+
+    def _needs_js_rendering(self, tree) -> bool:
+        """Detect app shells whose content only appears after JS runs."""
+        body = tree.find(".//body")
+        if body is None or _compile_selector(JS_SHELL_SELECTOR)(tree):
+            return True
+        # Inline state and framework scripts are not content the user can see
+        return len("".join(_visible_text_nodes(body)).strip()) < STATIC_MIN_TEXT_LENGTH
+
+    def _wait_for_idle(self, driver: WebDriver, timeout: float):
+        """Return as soon as the page stops loading resources, or after timeout."""
+        driver.set_script_timeout(timeout + 5)
+        waited = driver.execute_async_script(WAIT_FOR_IDLE_JS, NETWORK_IDLE_MS, int(timeout * 1000))
+        logger.debug(f"Page settled after {waited}ms")
+
+    def _scroll_to_bottom(self, driver: WebDriver, pause_time: float = 0.5, max_rounds: int = 50):
+        """Scroll to the bottom of the page to load lazy content."""
+        driver.set_script_timeout(pause_time * max_rounds + self.timeout)
+        driver.execute_async_script(SCROLL_TO_BOTTOM_JS, int(pause_time * 1000), max_rounds)
+
+    @staticmethod
+    def _build_rule_plans(rules: Dict[str, Dict]) -> List[RulePlan]:
+        """
+        Resolve extraction rules into plans once per scrape() call.
 
         Rules format:
         {
             "field_name": {
                 "selector": "css selector",
-                "attribute": "text" | "href" | "src" | etc.,
+                "attribute": "text" | "html" | "outer_html" | "href" | "src" | etc.,
                 "multiple": True/False,
                 "transform": optional callable
             }
         }
         """
+        plans = []
+        for field_name, rule in rules.items():
+            attribute = rule.get("attribute", "text")
+            get_value = _LXML_GETTERS.get(attribute) or partial(_lxml_attribute, attribute)
+            transform = rule.get("transform")
+            plans.append(RulePlan(
+                field=field_name,
+                selector=rule.get("selector"),
+                attribute=attribute,
+                get_value=get_value,
+                multiple=rule.get("multiple", False),
+                transform=transform if callable(transform) else None,
+            ))
+        return plans
+
+    def _parse_html(self, html: Union[str, bytes], base_url: Optional[str] = None):
+        """
+        Parse page HTML with lxml.
+
+        Links are made absolute against base_url to match what the browser
+        reports for href/src.
+        """
+        try:
+            tree = lxml.html.fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.error(f"Could not parse page HTML: {e}")
+            return None
+        if base_url:
+            tree.make_links_absolute(base_url, resolve_base_href=True)
+        return tree
+
+    def _extract_data_local(self, tree, rule_plans: List[RulePlan]) -> Dict[str, Any]:
+        """Extract data from a parsed page, running selectors in-process."""
+        if tree is None:
+            return {plan.field: None for plan in rule_plans}
+
         extracted = {}
 
-        for field_name, rule in rules.items():
+        for field_name, selector, _, get_value, multiple, transform in rule_plans:
             try:
-                selector = rule.get("selector")
-                attribute = rule.get("attribute", "text")
-                multiple = rule.get("multiple", False)
-                transform = rule.get("transform")
-
+                elements = _compile_selector(selector)(tree)
                 if multiple:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    values = []
-                    for el in elements:
-                        value = self._get_element_value(el, attribute)
-                        if transform and callable(transform):
-                            value = transform(value)
-                        values.append(value)
+                    values = [get_value(el) for el in elements]
+                    if transform:
+                        values = [transform(value) for value in values]
                     extracted[field_name] = values
+                elif elements:
+                    value = get_value(elements[0])
+                    extracted[field_name] = transform(value) if transform else value
                 else:
-                    element = driver.find_element(By.CSS_SELECTOR, selector)
-                    value = self._get_element_value(element, attribute)
-                    if transform and callable(transform):
-                        value = transform(value)
-                    extracted[field_name] = value
-
-            except NoSuchElementException:
-                extracted[field_name] = None
-                logger.warning(f"Element not found for field: {field_name}")
+                    extracted[field_name] = None
+                    logger.warning(f"Element not found for field: {field_name}")
 
             except Exception as e:
                 extracted[field_name] = None
@@ -320,17 +676,6 @@ class SeleniumScraper:
 
         return extracted
 
-    def _get_element_value(self, element, attribute: str) -> str:
-        """Get value from element based on attribute type."""
-        if attribute == "text":
-            return element.text.strip()
-        elif attribute == "html":
-            return element.get_attribute("innerHTML")
-        elif attribute == "outer_html":
-            return element.get_attribute("outerHTML")
-        else:
-            return element.get_attribute(attribute)
-
     async def scrape(
         self,
         url: str,
@@ -341,7 +686,9 @@ class SeleniumScraper:
         scroll_to_bottom: bool = False,
         wait_time: int = None,
         custom_js: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        include_html: bool = True,
+        fallback_wait_time: Optional[int] = None,
+    ) -> ScrapeResult:
         """
         Async method to scrape a URL.
 
@@ -354,54 +701,222 @@ class SeleniumScraper:
             scroll_to_bottom: Scroll to load lazy content
             wait_time: Additional wait time
             custom_js: Custom JavaScript to execute
+            include_html: Return the page HTML (skip it if only data/title is needed)
+            fallback_wait_time: Wait time used only if the page ends up in the
+                browser (e.g. a bot default); unlike wait_time it doesn't force Chrome
 
         Returns:
-            Dictionary with scraped data
+            Scrape result (use to_dict() for the plain dictionary form)
         """
-        return await asyncio.get_event_loop().run_in_executor(
-            _executor,
-            lambda: self._scrape_sync(
-                url=url,
-                wait_for=wait_for,
-                wait_type=wait_type,
-                extract_rules=extract_rules,
-                take_screenshot=take_screenshot,
-                scroll_to_bottom=scroll_to_bottom,
-                wait_time=wait_time,
-                custom_js=custom_js,
-            ),
-        )
+        # Static pages are fetched over plain HTTP; only fall back to Chrome
+        # when the page needs a browser or a browser-only feature is requested
+        rule_plans = self._build_rule_plans(extract_rules) if extract_rules else None
+
+        if self._can_use_static(url, wait_for, scroll_to_bottom, custom_js, take_screenshot, wait_time):
+            result = await asyncio.get_event_loop().run_in_executor(
+                _executor, self._scrape_static, url, rule_plans, include_html
+            )
+            if result is not None:
+                return result
+
+        config = {
+            "url": url,
+            "wait_for": wait_for,
+            "wait_type": wait_type,
+            "rule_plans": rule_plans,
+            "take_screenshot": take_screenshot,
+            "scroll_to_bottom": scroll_to_bottom,
+            "wait_time": wait_time or fallback_wait_time,
+            "custom_js": custom_js,
+            "include_html": include_html,
+        }
+
+        # Callable transforms (often lambdas) can't be sent to another process
+        if rule_plans and any(plan.transform for plan in rule_plans):
+            return await asyncio.get_event_loop().run_in_executor(
+                _executor, lambda: self._scrape_sync(**config)
+            )
+
+        config["options"] = {
+            "headless": self.headless,
+            "timeout": self.timeout,
+            "user_agent": self.user_agent,
+            "disable_images": self.disable_images,
+            "disable_css": self.disable_css,
+            "block_urls": self.block_urls,
+        }
+        executor = _get_process_executor()
+        try:
+            return await asyncio.get_event_loop().run_in_executor(
+                executor, _scrape_worker, config
+            )
+        except BrokenProcessPool as e:
+            _reset_process_executor(executor)
+            logger.error(f"Scraper worker process died while scraping {url}: {e}")
+            return ScrapeResult(url=url, error=f"Scraper worker crashed: {str(e)}")
 
     async def scrape_multiple(
         self,
         urls: List[str],
+        *,
+        concurrency: Optional[int] = None,
         **kwargs,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[ScrapeResult]:
         """
         Scrape multiple URLs concurrently.
 
         Args:
             urls: List of URLs to scrape
+            concurrency: Maximum scrapes in flight (defaults to the driver pool size)
             **kwargs: Arguments passed to scrape()
 
         Returns:
-            List of scraping results
+            List of scraping results, in the same order as urls
+        """
+        results = {}
+        async for result in self.scrape_multiple_iter(urls, concurrency=concurrency, **kwargs):
+            results[result.url] = result
+        return [results[url] for url in urls]
+
+    async def scrape_multiple_columnar(
+        self,
+        urls: List[str],
+        **kwargs,
+    ) -> Dict[str, List[Any]]:
         """
-        tasks = [self.scrape(url, **kwargs) for url in urls]
-        return await asyncio.gather(*tasks)
+        Scrape multiple URLs and return results column-wise.
+
+        Args:
+            urls: List of URLs to scrape
+            **kwargs: Arguments passed to scrape_multiple()
+
+        Returns:
+            Mapping of ScrapeResult field name to a list of values, one per URL
+        """
+        results = await self.scrape_multiple(urls, **kwargs)
+        return {
+            f.name: [getattr(result, f.name) for result in results]
+            for f in fields(ScrapeResult)
+        }
+
+    async def scrape_multiple_iter(
+        self,
+        urls: List[str],
+        *,
+        concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[ScrapeResult]:
+        """
+        Scrape multiple URLs, yielding each result as soon as it finishes.
+
+        Duplicate URLs are scraped once.
+
+        Args:
+            urls: List of URLs to scrape
+            concurrency: Maximum scrapes in flight (defaults to the driver pool size)
+            **kwargs: Arguments passed to scrape()
+
+        Yields:
+            Scraping results in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.SELENIUM_POOL_SIZE)
+
+        async def scrape_one(url: str) -> ScrapeResult:
+            async with semaphore:
+                return await self.scrape(url, **kwargs)
+
+        tasks = [asyncio.ensure_future(scrape_one(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding scrapes if the consumer gives up early
+            for task in tasks:
+                task.cancel()
 
     async def get_page_html(self, url: str, wait_for: Optional[str] = None) -> str:
         """Simple method to get page HTML."""
         result = await self.scrape(url, wait_for=wait_for)
-        return result.get("html", "")
+        return result.html or ""
 
     async def get_page_text(self, url: str) -> str:
         """Get all text content from a page."""
-        html = await self.get_page_html(url)
-        if html:
-            soup = BeautifulSoup(html, "lxml")
-            return soup.get_text(separator="\n", strip=True)
-        return ""
+        return await asyncio.get_event_loop().run_in_executor(
+            _executor, self._page_text_sync, url
+        )
+
+    def _page_text_sync(self, url: str) -> str:
+        """Read page text without serializing and re-parsing the HTML."""
+        if self._can_use_static(url):
+            fetched = self._fetch_static(url)
+            if fetched is not None:
+                body = fetched[1].find(".//body")
+                # Same text the browser's innerText gives: no script/style source
+                return "\n".join(text.strip() for text in _visible_text_nodes(body) if text.strip())
+
+        driver = self.pool.acquire()
+        broken = False
+        try:
+            self._apply_url_blocking(driver)
+            driver.get(url)
+            # The browser already has the layout; ask it for the rendered text
+            return driver.execute_script("return document.body.innerText") or ""
+        except Exception as e:
+            logger.error(f"Failed to get page text for {url}: {e}")
+            broken = isinstance(e, WebDriverException) and not isinstance(e, TimeoutException)
+            return ""
+        finally:
+            self.pool.release(driver, discard=broken)
+
+
+def _split_browser_budget() -> tuple:
+    """
+    Split SELENIUM_POOL_SIZE between the browser worker processes (one Chrome
+    each) and this process's own pool (transform scrapes, get_driver,
+    get_page_text), so together they stay within it.
+
+    Returns:
+        (worker processes, in-process pool size), each at least 1
+    """
+    total = settings.SELENIUM_POOL_SIZE
+    workers = max(1, min(os.cpu_count() or 1, total - 1))
+    return workers, max(1, total - workers)
+
+
+def _get_process_executor() -> ProcessPoolExecutor:
+    """Get or create the browser worker process pool."""
+    global _process_executor
+    if _process_executor is None:
+        workers = _split_browser_budget()[0]
+        # spawn avoids forking the server's event loop and threads
+        _process_executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_executor
+
+
+def _reset_process_executor(broken: ProcessPoolExecutor):
+    """Drop a broken process pool so the next scrape starts a fresh one."""
+    global _process_executor
+    if _process_executor is broken:
+        _process_executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+# Per-worker-process scrapers, keyed by their constructor options
+_worker_scrapers: Dict[tuple, "SeleniumScraper"] = {}
+
+
+def _scrape_worker(config: Dict[str, Any]) -> ScrapeResult:
+    """Run a browser scrape inside a worker process."""
+    options = config.pop("options")
+    key = tuple(sorted(options.items()))
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        # A worker runs one scrape at a time, so it never needs a second browser
+        scraper = _worker_scrapers[key] = SeleniumScraper(pool_size=1, **options)
+    return scraper._scrape_sync(**config)
 
 
 # Global scraper instance
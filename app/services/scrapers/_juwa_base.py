@@ -0,0 +1,412 @@
+"""
+Juwa agent panel.
+Juwa2 and Juwa777 run the same panel software on different hosts, so the
+API calls live here and each subclass only supplies its login flow.
+"""
+import asyncio
+import fcntl
+import logging
+import os
+import re
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+import httpx
+import orjson
+from selenium.webdriver.support.ui import WebDriverWait
+from app.core.config import settings
+from app.services.scrapers.base import UsernameMixin
+from app.services.scrapers.login_pool import block_images, login_driver_pool
+
+logger = logging.getLogger(__name__)
+
+_COOKIE_RE = re.compile(r"__cookie\d*=([^;]*)")
+
+# Finds and fills the login form in one WebDriver round-trip. Returns null
+# until the SPA has rendered every field (and loaded any <img>), so it can be
+# polled; otherwise returns [login button, ...extra selector matches].
+_FILL_LOGIN_JS = """
+const [user, pass, buttonText, ...selectors] = arguments;
+const u = document.querySelector("input[type=text]");
+const p = document.querySelector("input[type=password]");
+const button = buttonText
+    ? [...document.querySelectorAll("button")].find(b => b.textContent.includes(buttonText))
+    : document.querySelector("button[type=submit]");
+const found = selectors.map(s => document.querySelector(s));
+if (!u || !p || !button || found.some(el => !el || (el.tagName === "IMG" && !el.complete))) {
+    return null;
+}
+for (const [el, value] of [[u, user], [p, pass]]) {
+    el.value = value;
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+}
+return [button, ...found];
+"""
+
+
+class JuwaBaseScraper(UsernameMixin, ABC):
+    """
+    Shared Juwa panel client.
+    Subclasses set BASE_URL, GAME_NAME and GAME_INITIAL and implement _login().
+    """
+
+    BASE_URL = ""
+    GAME_NAME = ""
+    GAME_INITIAL = ""
+    # Panels with an image captcha need images to solve it
+    LOAD_IMAGES = True
+    SITE_STATUS_TTL = 30
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        base = cls.BASE_URL
+        cls.ENDPOINTS = {
+            "balance": f"{base}/api/agent/balance",
+            "search_user": f"{base}/api/user/userList",
+            "recharge": f"{base}/api/user/rechargeRedeem",
+            "pw_reset": f"{base}/api/user/resetUserPwd",
+            "signup": f"{base}/api/user/addUser"
+        }
+        cls.REFERER_LINKS = {
+            "index": f"{base}/HomeDetail",
+            "deposit": f"{base}/userManagement",
+        }
+        cls.BASE_HEADERS = {
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Content-Type': 'application/json;charset=UTF-8',
+            'Origin': base,
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+        }
+        # Shared by every instance so concurrent calls overlap on one pool
+        cls._async_client = None
+        cls._site_ok_until = 0.0
+
+    def __init__(self, username: str, password: str):
+        self.username = username
+        self.password = password
+        self.token = None
+        self.cookie = None
+        self._token_cache_path = Path(settings.TOKEN_CACHE_DIR) / f"{self.GAME_NAME}_{self.username}.json"
+
+    @abstractmethod
+    def _login(self, driver):
+        """
+        Fill the login form on the already-loaded page and wait until it lands.
+        Call _drain_perf_log() right before submitting so the token scan only
+        reads post-login traffic.
+        """
+        pass
+
+    @staticmethod
+    def _drain_perf_log(driver):
+        # Also drops anything left by another panel that used this browser
+        driver.get_log("performance")
+
+    def _fill_login_form(self, driver, *selectors, button_text: str = None, timeout: float = 10) -> list:
+        return WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script(_FILL_LOGIN_JS, self.username, self.password, button_text, *selectors)
+        )
+
+    @staticmethod
+    def _wait_for_auth_headers(driver, timeout: float):
+        # Each get_log call only returns entries logged since the last one,
+        # so this stops at the first request that carries the token
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for entry in driver.get_log("performance"):
+                message = entry.get("message")
+                if not message or "Network.requestWillBeSentExtraInfo" not in message:
+                    continue
+                try:
+                    headers = orjson.loads(message)["message"]["params"]["headers"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                token = headers.get("authorization") or headers.get("Authorization")
+                cookie = headers.get("cookie") or headers.get("Cookie")
+                if token and cookie:
+                    return token, cookie
+            time.sleep(0.25)
+        return None
+
+    def _fetch_token_selenium(self):
+        try:
+            # Browsers are shared with other panels; a failed login discards the driver
+            with login_driver_pool.checkout() as driver:
+                # Drop the previous session so the panel issues a fresh token
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                block_images(driver, not self.LOAD_IMAGES)
+                driver.get(f"{self.BASE_URL}/login")
+                self._login(driver)
+
+                # The dashboard's API calls carry the token; reload if none was seen
+                auth = self._wait_for_auth_headers(driver, 5)
+                if auth is None:
+                    driver.refresh()
+                    auth = self._wait_for_auth_headers(driver, 10)
+                if auth:
+                    self.token, self.cookie = auth
+
+        except Exception:
+            logger.exception("Token fetch failed")
+
+        return self.token and self.cookie
+
+    def close(self):
+        # The HTTP client is shared across instances and the browser lives in the pool
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        if cls._async_client is None or cls._async_client.is_closed:
+            cls._async_client = httpx.AsyncClient(
+                headers=cls.BASE_HEADERS,
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+            )
+        return cls._async_client
+
+    def _load_cached_token(self) -> bool:
+        try:
+            cached = orjson.loads(self._token_cache_path.read_bytes())
+        except (OSError, ValueError):
+            return False
+        if cached.get("exp", 0) <= time.time():
+            return False
+        self.token = cached["token"]
+        self.cookie = cached["cookie"]
+        return True
+
+    def _save_cached_token(self):
+        # Write to a temp file and rename so readers never see a partial file
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self._token_cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps({"token": self.token, "cookie": self.cookie, "exp": time.time() + settings.TOKEN_TTL_SEC}))
+            os.replace(tmp_path, self._token_cache_path)
+        except OSError as e:
+            logger.warning("Token cache write failed: %s", e)
+
+    def invalidate_token(self):
+        self.token = None
+        self.cookie = None
+        self._token_cache_path.unlink(missing_ok=True)
+
+    def authenticate(self):
+        self._token_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Only one worker logs in per account; the others wait and reuse its token
+        with open(self._token_cache_path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self._load_cached_token():
+                return
+            if not self._fetch_token_selenium():
+                raise Exception(f"Failed to authenticate {self.GAME_NAME} via Selenium")
+            self._save_cached_token()
+
+    def _get_headers(self, referer_url: str) -> dict:
+        if not self.token or not self.cookie:
+            self.authenticate()
+        headers = self._headers_cache.get(referer_url)
+        if headers is None:
+            headers = self._headers_cache[referer_url] = {
+                'Authorization': self.token,
+                'Referer': referer_url,
+                'Cookie': self.cookie
+            }
+        return headers
+
+    async def _get_headers_async(self, referer_url: str) -> dict:
+        # Selenium login blocks, so keep it off the event loop
+        if not self.token or not self.cookie:
+            await asyncio.to_thread(self.authenticate)
+        return self._get_headers(referer_url)
+
+    @property
+    def cookie(self):
+        return self._cookie
+
+    @cookie.setter
+    def cookie(self, value):
+        # Parse the __cookie payload field once per login rather than per request
+        self._cookie = value
+        # Token and cookie are always replaced together, so rebuild headers lazily
+        self._headers_cache = {}
+        match = _COOKIE_RE.search(value or "")
+        self._cookie_fields = {"__cookie": match.group(1)} if match else {}
+
+    def _cookie_field(self) -> dict:
+        return self._cookie_fields
+
+    async def _check_site_status(self) -> bool:
+        # A recent successful check is trusted, so polling loops skip it
+        cls = type(self)
+        if time.monotonic() < cls._site_ok_until:
+            return True
+        try:
+            response = await self._get_async_client().head(
+                f"{self.BASE_URL}/login", timeout=httpx.Timeout(4.0, connect=2.0)
+            )
+        except httpx.HTTPError:
+            return False
+        if response.status_code < 500:
+            cls._site_ok_until = time.monotonic() + self.SITE_STATUS_TTL
+            return True
+        return False
+
+    @staticmethod
+    def _is_auth_error(response, data: dict) -> bool:
+        return (
+            response.status_code == 401
+            or data.get("status_code") == 401
+            or data.get("code") in (401, 4010)
+        )
+
+    async def _fetch_balance(self, payload: bytes):
+        headers = await self._get_headers_async(self.REFERER_LINKS["index"])
+        response = await self._get_async_client().post(self.ENDPOINTS["balance"], headers=headers, content=payload)
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            data = {}
+        return data, self._is_auth_error(response, data)
+
+    async def _post(self, endpoint: str, referer: str, fields: dict) -> dict:
+        """
+        POST a JSON body with the session's __cookie field. A rejected token is
+        evicted from the shared cache, and the call is retried once on a fresh
+        login; only a definite auth error retries, so rechargeRedeem can't be
+        applied twice.
+        """
+        for _ in range(2):
+            headers = await self._get_headers_async(self.REFERER_LINKS[referer])
+            # __cookie belongs to the session, so it is rebuilt after a re-login
+            payload = orjson.dumps({**fields, **self._cookie_field(), "locale": "en", "timezone": "cst"})
+            response = await self._get_async_client().post(self.ENDPOINTS[endpoint], headers=headers, content=payload)
+            try:
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                data = None
+            if not isinstance(data, dict):
+                return {"msg": f"Unexpected response from panel (HTTP {response.status_code})"}
+            if not self._is_auth_error(response, data):
+                return data
+            # The next attempt logs in again via _get_headers_async
+            self.invalidate_token()
+        return data
+
+    async def get_agent_balance(self):
+        try:
+            if not await self._check_site_status():
+                return None, "Site unreachable"
+
+            payload = orjson.dumps({"locale": "en", "timezone": "cst"})
+            data, auth_error = await self._fetch_balance(payload)
+
+            if not (data.get("code") == 200 and data.get("data")):
+                # Only an expired token is worth a Selenium login; other
+                # failures (gateway errors, bad bodies) are retried as-is
+                if auth_error:
+                    self.invalidate_token()
+                    await asyncio.to_thread(self.authenticate)
+                data, _ = await self._fetch_balance(payload)
+
+            if data.get("code") == 200 and data.get("data"):
+                return float(data["data"]["t"]), "Success"
+
+            return None, "Failed to fetch balance"
+
+        except Exception as e:
+            return None, str(e)
+
+    def _signup_fields(self, fullname: str, username: str):
+        # (nickname, password) for a new player
+        return fullname.replace(" ", ""), self._generate_username(fullname)
+
+    async def player_signup(self, fullname: str, requested_username: str = None):
+        try:
+            if not requested_username:
+                requested_username = self._generate_username(fullname)
+
+            nickname, password = self._signup_fields(fullname, requested_username)
+
+            data = await self._post("signup", "deposit", {
+                "account": requested_username,
+                "nickname": nickname,
+                "login_pwd": password,
+                "check_pwd": password,
+                "captcha": None,
+                "t": "",
+            })
+
+            if data.get("code") == 200 and data.get("msg") == "success":
+                return {
+                    "status": "success",
+                    "username": requested_username,
+                    "password": password,
+                    "message": "User Signed up successfully!"
+                }
+
+            return {"status": "error", "message": data.get("msg", "Signup failed")}
+
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    async def _get_user_info(self, username: str):
+        data = await self._post("search_user", "index", {
+            "page": 1,
+            "limit": 20,
+            "type": 1,
+            "search": username,
+            "order_by": "desc",
+            "sort_field": "register_time",
+        })
+        want = username.casefold()
+        for user in (data.get("data") or {}).get("list", ()):
+            if user["login_name"].casefold() == want:
+                return user
+        return None
+
+    async def recharge_user(self, username: str, amount: float):
+        return await self._perform_transaction(username, amount, "deposit")
+
+    async def redeem_user(self, username: str, amount: float):
+        return await self._perform_transaction(username, amount, "withdraw")
+
+    def _transaction_amount(self, amount: float):
+        return abs(amount)
+
+    async def _perform_transaction(self, username: str, amount: float, flow_type: str):
+        try:
+            user_info = await self._get_user_info(username)
+            if not user_info:
+                return {"status": "error", "message": "User not found"}
+
+            user_id = user_info["user_id"]
+            user_balance = user_info["balance"]
+            amount = self._transaction_amount(amount)
+
+            opera_type = 2 if flow_type == "withdraw" else 1
+            result = await self._post("recharge", "deposit", {
+                "user_id": str(user_id),
+                "type": opera_type,
+                "account": username,
+                "balance": float(user_balance),
+                "amount": str(amount),
+                "remark": "",
+                "bonusStatus": 0,
+            })
+
+            if result.get("code") == 200 or result.get("status") == 200:
+                return {"status": "success", "message": result.get("msg", "Success")}
+
+            return {"status": "error", "message": result.get("msg", "Transaction failed")}
+
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
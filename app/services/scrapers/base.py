@@ -1,4 +1,6 @@
+import random
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Any, Tuple, Optional, Union
 
 class BaseGameScraper(ABC):
@@ -17,6 +19,12 @@ class BaseGameScraper(ABC):
         """Close the browser instance."""
         pass
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     @abstractmethod
     async def get_agent_balance(self) -> Tuple[Optional[float], str]:
         """
@@ -48,3 +56,33 @@ class BaseGameScraper(ABC):
         Returns: Dictionary with status and transaction details.
         """
         pass
+
+
+@lru_cache(maxsize=1024)
+def _username_base(initial: str, fullname: str, first_initial: bool) -> str:
+    """Deterministic username prefix, cached so signup retries skip re-parsing."""
+    n = fullname.lower().split()
+    if not n:
+        return f"{initial}user"[:10]
+    first = n[0][0] if first_initial else n[0]
+    return f"{initial}{first}{n[-1][0]}"[:10]
+
+
+class UsernameMixin:
+    """
+    Shared player username generator for scrapers that define GAME_INITIAL.
+    Produces e.g. "egjohnd42": initial, first name, last initial, 2 digits,
+    padded with random digits to at least 7 characters. With
+    USERNAME_FIRST_INITIAL the first name is shortened too ("egjd42...").
+    """
+
+    GAME_INITIAL = ""
+    USERNAME_FIRST_INITIAL = False
+
+    def _generate_username(self, fullname: str) -> str:
+        base = _username_base(self.GAME_INITIAL, fullname, self.USERNAME_FIRST_INITIAL)
+        username = f"{base}{random.randrange(100):02d}"
+        pad = 7 - len(username)
+        if pad > 0:
+            username += f"{random.randrange(10 ** pad):0{pad}d}"
+        return username
@@ -1,12 +1,28 @@
-import json
+import asyncio
+import logging
+import os
+import tempfile
+import threading
 import time
 import random
-import requests
-import undetected_chromedriver as uc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+import httpx
+import orjson
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
+from app.services.scraper import selenium_scraper
+
+logger = logging.getLogger(__name__)
+
+# Runs the agent-balance lookup alongside the user search in transactions
+_lookup_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cf777-lookup")
 
 
 class CashFrenzy777Scraper:
@@ -26,25 +42,51 @@ class CashFrenzy777Scraper:
         "pw_reset": f"{BASE_URL}/admin/player/resetpw",
         "signup": f"{BASE_URL}/admin/player/insert"
     }
+    # Headers shared by every API call; set once on the session
+    BASE_HEADERS = {
+        'accept': 'application/json, text/javascript, */*; q=0.01',
+        'accept-language': 'en-US,en;q=0.9',
+        'content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
+        'origin': BASE_URL,
+        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+        'x-requested-with': 'XMLHttpRequest',
+    }
+    LOGIN_LOCATORS = (
+        (By.CSS_SELECTOR, "input[type='text'][name='username']"),
+        (By.CSS_SELECTOR, "input[type='password'][name='password']"),
+        (By.CSS_SELECTOR, "button[type='submit']"),
+    )
     GAME_NAME = "cashfrenzy777"
     GAME_INITIAL = "cf"
+    SITE_STATUS_TTL = 30
 
     def __init__(self, username: str = None, password: str = None):
         self.username = username or settings.CASHFRENZY777_USER
         self.password = password or settings.CASHFRENZY777_PASS
         self.token = None
         self.cookie = None
+        self._token_expires_at = 0.0
+        self._auth_lock = threading.Lock()
+        self._site_ok_until = 0.0
+        self._driver = None
+        self._driver_finalizer = None
+        self._token_cache_path = Path(settings.TOKEN_CACHE_DIR) / f"cashfrenzy_{self.username}.json"
+
+        # All calls go to one host, so a single HTTP/2 connection carries
+        # them all. Only connection failures are retried, so a POST is
+        # never re-sent after the server may have processed it.
+        self._client = httpx.Client(
+            headers=self.BASE_HEADERS,
+            timeout=10.0,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=8),
+            ),
+        )
 
     def _fill_input_fields(self, driver):
-        user_input = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//input[@type='text' and @name='username']"))
-        )
-        pass_input = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//input[@type='password' and @name='password']"))
-        )
-        login_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']"))
-        )
+        user_input, pass_input, login_btn = WebDriverWait(driver, 10).until(self._login_form_ready)
 
         user_input.click()
         user_input.clear()
@@ -56,95 +98,208 @@ class CashFrenzy777Scraper:
 
         return login_btn
 
-    def _fetch_token_selenium(self):
-        options = uc.ChromeOptions()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument("--disable-gpu")
+    @classmethod
+    def _login_form_ready(cls, driver):
+        # One poll loop for all three fields instead of three sequential waits
+        try:
+            elements = tuple(driver.find_element(*locator) for locator in cls.LOGIN_LOCATORS)
+        except NoSuchElementException:
+            return False
+        if all(el.is_displayed() and el.is_enabled() for el in elements):
+            return elements
+        return False
+
+    def _get_driver(self):
+        # One browser per scraper, kept warm for re-logins. It needs performance
+        # logging to see request headers, so it can't come from the shared pool.
+        if self._driver is not None:
+            return self._driver
+
+        options = selenium_scraper.build_chrome_options()
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        driver = selenium_scraper.launch_chrome(options)
+        driver.implicitly_wait(0)
+
+        self._driver = driver
+        self._driver_finalizer = weakref.finalize(self, driver.quit)
+        return driver
+
+    def _discard_driver(self):
+        if self._driver_finalizer is not None:
+            self._driver_finalizer()
+        self._driver = None
+        self._driver_finalizer = None
+
+    @staticmethod
+    def _wait_for_auth_headers(driver, timeout: float):
+        # Each get_log call only returns entries logged since the last one,
+        # so this stops at the first request that carries the token
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for entry in driver.get_log("performance"):
+                message = entry["message"]
+                if "Network.requestWillBeSentExtraInfo" not in message:
+                    continue
+                headers = orjson.loads(message)["message"]["params"].get("headers", {})
+                headers = {k.lower(): v for k, v in headers.items()}
+                if "authorization" in headers and "cookie" in headers:
+                    return headers["authorization"], headers["cookie"]
+            time.sleep(0.25)
+        return None
 
-        caps = options.to_capabilities()
-        caps['goog:loggingPrefs'] = {'performance': 'ALL'}
+    def _login_in_driver(self, driver):
+        # Drop the previous session so the panel issues a fresh token
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
 
-        driver = uc.Chrome(options=options)
+        driver.get(f"{self.BASE_URL}/admin/login")
+        WebDriverWait(driver, 15).until(EC.url_contains("login"))
 
-        try:
-            driver.get(f"{self.BASE_URL}/admin/login")
-            WebDriverWait(driver, 15).until(EC.url_contains("login"))
+        login_btn = self._fill_input_fields(driver)
+        driver.get_log("performance")  # discard requests made before login
+        login_btn.click()
 
-            login_btn = self._fill_input_fields(driver)
-            login_btn.click()
+        expected_url = f"{self.BASE_URL}/admin/index"
+        WebDriverWait(driver, 20).until(EC.url_to_be(expected_url))
 
-            expected_url = f"{self.BASE_URL}/admin/index"
-            WebDriverWait(driver, 20).until(EC.url_to_be(expected_url))
-            time.sleep(2)
+        # The dashboard's API calls carry the token; reload if none was seen
+        captured = self._wait_for_auth_headers(driver, 5)
+        if captured is None:
             driver.refresh()
             WebDriverWait(driver, 20).until(EC.url_to_be(expected_url))
-            time.sleep(3)
-
-            logs = driver.get_log("performance")
-
-            for entry in logs:
-                try:
-                    log = json.loads(entry["message"])["message"]
-                    if log["method"] == "Network.requestWillBeSentExtraInfo":
-                        headers = log["params"]["headers"]
-                        if "Authorization" in headers and "Cookie" in headers:
-                            self.token = headers["Authorization"]
-                            self.cookie = headers["Cookie"]
-                            break
-                except:
-                    continue
+            captured = self._wait_for_auth_headers(driver, 10)
 
-        except Exception as e:
-            print(f"Token fetch failed: {e}")
-        finally:
-            driver.quit()
+        if captured is not None:
+            self.token, self.cookie = captured
+
+    def _fetch_token_selenium(self):
+        self.token = None
+        self.cookie = None
+        try:
+            self._login_in_driver(self._get_driver())
+        except Exception:
+            logger.exception("Token fetch failed")
+            # A wedged browser is replaced on the next attempt
+            self._discard_driver()
 
         return self.token and self.cookie
 
+    def close(self):
+        self._discard_driver()
+        self._client.close()
+
+    def _token_valid(self) -> bool:
+        return bool(self.token and self.cookie) and time.time() < self._token_expires_at
+
+    def _set_session_cookies(self):
+        self._client.cookies.clear()
+        for pair in self.cookie.split(";"):
+            name, sep, value = pair.strip().partition("=")
+            if sep:
+                self._client.cookies.set(name, value)
+
+    def _load_cached_token(self) -> bool:
+        try:
+            cached = orjson.loads(self._token_cache_path.read_bytes())
+        except (OSError, ValueError):
+            return False
+        if cached.get("exp", 0) <= time.time():
+            return False
+        self.token = cached["token"]
+        self.cookie = cached["cookie"]
+        self._token_expires_at = cached["exp"]
+        self._set_session_cookies()
+        return True
+
+    def _save_cached_token(self):
+        # Write to a temp file and rename so readers never see a partial file
+        try:
+            self._token_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._token_cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps({"token": self.token, "cookie": self.cookie, "exp": self._token_expires_at}))
+            os.replace(tmp_path, self._token_cache_path)
+        except OSError as e:
+            logger.warning("Token cache write failed: %s", e)
+
+    def invalidate_token(self):
+        self.token = None
+        self.cookie = None
+        self._token_expires_at = 0.0
+        self._token_cache_path.unlink(missing_ok=True)
+
     def authenticate(self):
-        if not self._fetch_token_selenium():
-            raise Exception("Failed to authenticate CashFrenzy777 via Selenium")
+        with self._auth_lock:
+            # Another thread may have logged in while we waited for the lock
+            if self._token_valid() or self._load_cached_token():
+                return
+            if not self._fetch_token_selenium():
+                raise Exception("Failed to authenticate CashFrenzy777 via Selenium")
+            self._token_expires_at = time.time() + settings.TOKEN_TTL_SEC
+            self._set_session_cookies()
+            self._save_cached_token()
 
     def _get_headers(self, referer_url: str) -> dict:
-        if not self.token or not self.cookie:
+        if not self._token_valid():
             self.authenticate()
-        return {
-            'accept': 'application/json, text/javascript, */*; q=0.01',
-            'accept-language': 'en-US,en;q=0.9',
-            'authorization': self.token,
-            'content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
-            'origin': self.BASE_URL,
-            'referer': referer_url,
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
-            'x-requested-with': 'XMLHttpRequest',
-            'Cookie': self.cookie
-        }
+        return {'authorization': self.token, 'referer': referer_url}
+
+    @staticmethod
+    def _is_unauthorized(response, data) -> bool:
+        if response.status_code in (401, 403):
+            return True
+        return isinstance(data, dict) and data.get("status_code") in (401, 403)
+
+    def _request(self, method: str, url: str, referer_url: str, replay: bool = True, **kwargs):
+        """
+        Send an API request. A rejected token is dropped so the next call logs
+        in again; with replay the request is re-sent once on the new token.
+        Transaction POSTs pass replay=False so they are never sent twice.
+        """
+        for attempt in range(2):
+            headers = self._get_headers(referer_url)
+            response = self._client.request(method, url, headers=headers, **kwargs)
+            try:
+                data = orjson.loads(response.content)
+            except ValueError:
+                data = None
+            if self._is_unauthorized(response, data):
+                self.invalidate_token()
+                if replay and attempt == 0:
+                    continue
+                return {"message": "Session expired, please retry"}
+            if not isinstance(data, dict):
+                # Gateway error pages and the like; not proof the token is bad
+                return {"message": f"Unexpected response from panel (HTTP {response.status_code})"}
+            return data
 
     def _check_site_status(self) -> bool:
+        # A recent successful check is trusted, so batched calls skip it
+        if time.time() < self._site_ok_until:
+            return True
         try:
-            response = requests.get(self.BASE_URL, timeout=10)
-            return response.status_code == 200
-        except:
+            response = self._client.head(self.BASE_URL, timeout=5, follow_redirects=True)
+            if response.status_code in (405, 501):
+                # Some servers don't implement HEAD; that says nothing about uptime
+                response = self._client.get(self.BASE_URL, timeout=5, follow_redirects=True)
+        except httpx.HTTPError:
             return False
+        if response.status_code < 400:
+            self._site_ok_until = time.time() + self.SITE_STATUS_TTL
+            return True
+        return False
 
     async def get_agent_balance(self):
         try:
-            if not self._check_site_status():
+            # The client is sync and _request may run a Selenium login, so keep
+            # both off the event loop
+            if not await asyncio.to_thread(self._check_site_status):
                 return None, "Site unreachable"
 
-            headers = self._get_headers(self.REFERER_LINKS["index"])
-            response = requests.post(self.ENDPOINTS["balance"], headers=headers)
-            data = response.json()
-
-            if not (data.get("status_code") == 200 and data.get("data")):
-                self.authenticate()
-                headers = self._get_headers(self.REFERER_LINKS["index"])
-                response = requests.post(self.ENDPOINTS["balance"], headers=headers)
-                data = response.json()
+            data = await asyncio.to_thread(
+                self._request, "POST", self.ENDPOINTS["balance"], self.REFERER_LINKS["index"]
+            )
 
-            if data.get("status_code") == 200 and data.get("data"):
+            if data.get("status_code") == 200 and data.get("data") is not None:
                 return float(data["data"]), "Success"
 
             return None, "Failed to fetch balance"
@@ -169,11 +324,15 @@ class CashFrenzy777Scraper:
             nickname = fullname.replace(" ", "")[:15]
             password = requested_username
 
-            headers = self._get_headers(self.REFERER_LINKS["signup"])
-            payload = f"username={requested_username}&nickname={nickname}&money=&password={password}&password_confirmation={password}"
+            payload = urlencode({
+                "username": requested_username,
+                "nickname": nickname,
+                "money": "",
+                "password": password,
+                "password_confirmation": password,
+            }).encode("ascii")
 
-            response = requests.post(self.ENDPOINTS["signup"], headers=headers, data=payload)
-            data = response.json()
+            data = self._request("POST", self.ENDPOINTS["signup"], self.REFERER_LINKS["signup"], content=payload)
 
             if data.get("status_code") == 200 and data.get("message") and data.get("data"):
                 return {
@@ -189,9 +348,7 @@ class CashFrenzy777Scraper:
             return {"status": "error", "message": str(e)}
 
     def _get_user_info(self, username: str):
-        headers = self._get_headers(self.REFERER_LINKS["index"])
-        response = requests.get(self.ENDPOINTS["search_user"] + username, headers=headers)
-        data = response.json()
+        data = self._request("GET", self.ENDPOINTS["search_user"] + quote(username), self.REFERER_LINKS["index"])
 
         if data.get("data"):
             for user in data.get("data", []):
@@ -207,13 +364,14 @@ class CashFrenzy777Scraper:
 
     def _perform_transaction(self, username: str, amount: float, flow_type: str):
         try:
-            # Get agent balance first
-            headers = self._get_headers(self.REFERER_LINKS["index"])
-            balance_response = requests.post(self.ENDPOINTS["balance"], headers=headers)
-            balance_data = balance_response.json()
+            # Agent balance and user lookup are independent; fetch them together
+            balance_future = _lookup_executor.submit(
+                self._request, "POST", self.ENDPOINTS["balance"], self.REFERER_LINKS["index"]
+            )
+            user_info = self._get_user_info(username)
+            balance_data = balance_future.result()
             vendor_balance = float(balance_data.get("data", 0)) if balance_data.get("status_code") == 200 else 0
 
-            user_info = self._get_user_info(username)
             if not user_info:
                 return {"status": "error", "message": "User not found"}
 
@@ -232,11 +390,15 @@ class CashFrenzy777Scraper:
                 balance_val = user_balance
                 endpoint = self.ENDPOINTS["withdraw_user"]
 
-            payload = f"id={user_id}&{key}={balance_val}&opera_type={opera_type}&balance={amount_val}&remark="
+            payload = urlencode({
+                "id": user_id,
+                key: balance_val,
+                "opera_type": opera_type,
+                "balance": amount_val,
+                "remark": "",
+            }).encode("ascii")
 
-            headers = self._get_headers(self.REFERER_LINKS[flow_type])
-            response = requests.post(endpoint, headers=headers, data=payload)
-            result = response.json()
+            result = self._request("POST", endpoint, self.REFERER_LINKS[flow_type], replay=False, content=payload)
 
             if result.get("status_code") == 200:
                 return {"status": "success", "message": result.get("message", "Success")}
@@ -0,0 +1,156 @@
+"""
+WebDriver Pool.
+Keeps warm Chrome instances around so scrapes don't pay browser startup each time.
+"""
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPool:
+    """
+    Bounded pool of reusable WebDriver instances.
+    At most `max_drivers` browsers exist at once; idle ones are reused
+    most-recently-released first so their caches stay warm.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], WebDriver],
+        max_drivers: int = 4,
+        on_quit: Optional[Callable[[WebDriver], None]] = None,
+        max_uses: Optional[int] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Callable that creates a new configured driver
+            max_drivers: Maximum number of live drivers
+            on_quit: Called after a driver is quit, to free its resources
+            max_uses: Quit a driver after this many checkouts (None never recycles)
+        """
+        self._factory = factory
+        self._on_quit = on_quit
+        self.max_drivers = max_drivers
+        self.max_uses = max_uses
+        self._uses: Dict[int, int] = {}
+        self._idle: "queue.LifoQueue[WebDriver]" = queue.LifoQueue()
+        self._slots = threading.Semaphore(max_drivers)
+        self._closed = False
+
+    def warm(self, count: Optional[int] = None):
+        """Pre-start idle drivers up to `count` (defaults to the pool size)."""
+        count = min(count or self.max_drivers, self.max_drivers)
+        drivers = [self.acquire() for _ in range(count - self._idle.qsize())]
+        for driver in drivers:
+            self._uses[id(driver)] -= 1  # warming is not a real checkout
+            self.release(driver, reset=False)
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Borrow a driver, creating one if no idle driver is available.
+
+        Args:
+            timeout: Seconds to wait for a free slot (None waits forever)
+        """
+        if self._closed:
+            raise RuntimeError("WebDriver pool is shut down")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Timed out waiting for a free WebDriver")
+
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                driver = self._factory()
+            except Exception:
+                self._slots.release()
+                raise
+
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver: WebDriver, discard: bool = False, reset: bool = True):
+        """
+        Return a borrowed driver to the pool.
+
+        Args:
+            driver: Driver previously returned by acquire()
+            discard: Quit the driver instead of reusing it (e.g. after a crash)
+            reset: Clear cookies, storage and extra tabs before reuse
+        """
+        try:
+            if not discard and reset:
+                try:
+                    self._reset(driver)
+                except Exception as e:
+                    logger.warning(f"Discarding WebDriver that failed to reset: {e}")
+                    discard = True
+
+            # Long-lived browsers slowly leak memory, so retire them periodically
+            if self.max_uses and self._uses.get(id(driver), 0) >= self.max_uses:
+                discard = True
+
+            if discard or self._closed:
+                self._quit(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[WebDriver]:
+        """
+        Borrow a driver for the duration of a with-block.
+        The driver is discarded if the block raises, since it may be wedged.
+
+        Args:
+            timeout: Seconds to wait for a free slot (None waits forever)
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        self.release(driver)
+
+    def shutdown(self):
+        """Quit all idle drivers and refuse further use."""
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    @staticmethod
+    def _reset(driver: WebDriver):
+        """Wipe per-scrape state so the next caller gets a clean browser."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+        )
+        driver.get("about:blank")
+
+    def _quit(self, driver: WebDriver):
+        """Quit a driver, ignoring errors from already-dead browsers."""
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting WebDriver: {e}")
+        if self._on_quit:
+            self._on_quit(driver)
@@ -1,16 +1,29 @@
 import hashlib
-import uuid
+import secrets
 import time
-import random
 import base64
+from functools import lru_cache
+from urllib.parse import urlencode
 import requests
+import httpx
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import padding
 from app.core.config import settings
+from app.services.scrapers.base import UsernameMixin
 
 
-class EGame99Scraper:
+@lru_cache(maxsize=4)
+def _derive_egame99_key(password: str) -> bytes:
+    # The appsecret key is md5(md5(password)) as hex, fixed per agent password
+    key_md5_1 = hashlib.md5(password.lower().encode('utf-8')).hexdigest()
+    return hashlib.md5(key_md5_1.encode('utf-8')).hexdigest().encode('utf-8')
+
+
+class EGame99Scraper(UsernameMixin):
     DEPOSIT_URL = "https://papi.egame99.vip/fast/user/deposit"
     WITHDRAW_URL = "https://papi.egame99.vip/fast/user/withdrawal"
     CHECK_BALANCE_URL = "https://papi.egame99.vip/fast/user/balance"
@@ -47,6 +60,9 @@ class EGame99Scraper:
     GAME_NAME = "egame99"
     GAME_INITIAL = "eg"
 
+    # Shared by every instance so async balance checks overlap on one pool
+    _async_client = None
+
     def __init__(self, username: str = None, password: str = None):
         self.username = username or settings.EGAME99_USER
         self.password = password or settings.EGAME99_PASS
@@ -56,19 +72,49 @@ class EGame99Scraper:
         self.app_secret = None
         self.agent_balance = None
 
+        # Keep-alive pool so consecutive API calls reuse one TLS connection.
+        # Retry's default allowed methods exclude POST, so transactions are never replayed.
+        self._session = requests.Session()
+        self._session.headers.update(self.HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self):
+        self._session.close()
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        if cls._async_client is None or cls._async_client.is_closed:
+            cls._async_client = httpx.AsyncClient(
+                http2=True,
+                headers=cls.HEADERS,
+                timeout=10,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return cls._async_client
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _generate_timestamp_and_request_id(self):
-        self.request_id = uuid.uuid4().hex[:32]
-        self.timestamp = str(int(time.time() * 1000))
+        self.request_id = secrets.token_hex(16)
+        self.timestamp = str(time.time_ns() // 1_000_000)
 
     def _aes_decrypt(self, appsecret_encrypted: str, agent_password: str) -> str:
-        decoded_data = base64.b64decode(appsecret_encrypted)
+        # cryptography accepts any bytes-like object, so slice without copying
+        decoded_data = memoryview(base64.b64decode(appsecret_encrypted))
         iv = decoded_data[:16]
         encrypted_data = decoded_data[16:]
 
-        agent_password_lower = agent_password.lower()
-        key_md5_1 = hashlib.md5(agent_password_lower.encode('utf-8')).hexdigest()
-        key_md5_2 = hashlib.md5(key_md5_1.encode('utf-8')).hexdigest()
-        aes_key = key_md5_2.encode('utf-8')
+        aes_key = _derive_egame99_key(agent_password)
 
         cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv), backend=default_backend())
         decryptor = cipher.decryptor()
@@ -80,42 +126,43 @@ class EGame99Scraper:
         return appsecret.decode('utf-8')
 
     def _generate_signature(self, params: dict, appsecret: str) -> str:
-        filtered = {k: v for k, v in params.items() if k != 'sign'}
-        sorted_items = sorted(filtered.items())
-        param_str = '&'.join(f"{k}={v}" for k, v in sorted_items)
+        # _build_params inserts keys in alphabetical order, so no sort is needed
+        param_str = '&'.join(f"{k}={v}" for k, v in params.items() if k != 'sign')
         string_to_sign = param_str + (appsecret or "")
         return hashlib.md5(string_to_sign.encode('utf-8')).hexdigest()
 
     def _build_params(self, **kwargs) -> dict:
-        signature_param = {
-            "requestid": self.request_id,
-            "timestamp": self.timestamp,
-            "account": kwargs.get("account")
-        }
+        # Keys are added in alphabetical order, the order the signature uses
+        signature_param = {"account": kwargs.get("account")}
 
-        if self.app_id:
-            signature_param["appid"] = self.app_id
         if kwargs.get("amount") is not None:
             signature_param["amount"] = kwargs["amount"]
-        if kwargs.get("sign") is not None:
-            signature_param["sign"] = kwargs["sign"]
+        if self.app_id:
+            signature_param["appid"] = self.app_id
         if kwargs.get("passwd") is not None:
             signature_param["passwd"] = kwargs["passwd"]
+        signature_param["requestid"] = self.request_id
+        signature_param["timestamp"] = self.timestamp
 
         return signature_param
 
-    def authenticate(self):
+    def _signed_body(self, appsecret: str, **kwargs) -> bytes:
+        # Fresh requestid/timestamp, then sign the same params that get sent.
+        # The form body is encoded here once; the session already sets its Content-Type.
         self._generate_timestamp_and_request_id()
+        # requests form encoding left out None values; urlencode would send "None"
+        params = {k: v for k, v in self._build_params(**kwargs).items() if v is not None}
+        params["sign"] = self._generate_signature(params, appsecret)
+        return urlencode(params).encode("ascii")
 
-        unsigned_params = self._build_params(account=self.username, passwd=self.password)
-        signed_params = self._build_params(
-            account=self.username,
-            sign=self._generate_signature(unsigned_params, None),
-            passwd=self.password
-        )
+    def _signed_post(self, url: str, **kwargs) -> dict:
+        body = self._signed_body(self.app_secret, **kwargs)
+        return orjson.loads(self._session.post(url, data=body).content)
 
-        response = requests.post(self.LOGIN_URL, headers=self.HEADERS, data=signed_params).json()
+    def _login_body(self) -> bytes:
+        return self._signed_body(None, account=self.username, passwd=self.password)
 
+    def _handle_login_response(self, response: dict):
         if response.get("code") == 200 and response.get("data", {}).get("appid"):
             self.app_id = response["data"]["appid"]
             self.app_secret = self._aes_decrypt(response["data"]["appsecret_encrypted"], self.password)
@@ -124,49 +171,34 @@ class EGame99Scraper:
         else:
             raise Exception("Login failed or invalid response")
 
-    def _check_site_status(self) -> bool:
-        try:
-            response = requests.get(self.BASE_URL, timeout=10)
-            return response.status_code == 200
-        except:
-            return False
+    def authenticate(self):
+        response = self._session.post(self.LOGIN_URL, data=self._login_body())
+        return self._handle_login_response(orjson.loads(response.content))
+
+    async def _authenticate_async(self):
+        response = await self._get_async_client().post(self.LOGIN_URL, content=self._login_body())
+        return self._handle_login_response(orjson.loads(response.content))
 
     async def get_agent_balance(self):
         try:
-            if not self._check_site_status():
+            try:
+                balance = await self._authenticate_async()
+            except httpx.TransportError:
+                # A failed connect or timeout on the first call means the site is down
                 return None, "Site unreachable"
-
-            balance = self.authenticate()
             return float(balance), "Success"
 
         except Exception as e:
             return None, str(e)
 
-    def _generate_username(self, fullname: str) -> str:
-        n = fullname.lower().split()
-        base = f"{self.GAME_INITIAL}{n[0]}{n[-1][0]}" if n else f"{self.GAME_INITIAL}user"
-        base = base[:10]
-        username = f"{base}{random.randrange(100):02d}"
-        if len(username) < 7:
-            username += "".join(str(random.randint(0, 9)) for _ in range(7 - len(username)))
-        return username
-
     def player_signup(self, fullname: str, requested_username: str = None):
         try:
             if not requested_username:
                 requested_username = self._generate_username(fullname)
 
             password = requested_username
-            self._generate_timestamp_and_request_id()
 
-            unsigned_params = self._build_params(account=requested_username, passwd=password)
-            signed_params = self._build_params(
-                account=requested_username,
-                passwd=password,
-                sign=self._generate_signature(unsigned_params, self.app_secret)
-            )
-
-            response = requests.post(self.SIGNUP_URL, headers=self.HEADERS, data=signed_params).json()
+            response = self._signed_post(self.SIGNUP_URL, account=requested_username, passwd=password)
 
             if response.get("code") == 1 and response.get("data"):
                 return {
@@ -184,16 +216,7 @@ class EGame99Scraper:
 
     def _get_user_balance(self, username: str):
         self.authenticate()
-        self._generate_timestamp_and_request_id()
-        
-        unsigned_params = self._build_params(account=username)
-        signed_params = self._build_params(
-            account=username,
-            sign=self._generate_signature(unsigned_params, self.app_secret)
-        )
-        
-        response = requests.post(self.CHECK_BALANCE_URL, headers=self.HEADERS, data=signed_params).json()
-        return response
+        return self._signed_post(self.CHECK_BALANCE_URL, account=username)
 
     def recharge_user(self, username: str, amount: float):
         return self._perform_transaction(username, amount, "deposit")
@@ -214,17 +237,8 @@ class EGame99Scraper:
             user_balance = float(user_info.get("data", {}).get("balance", 0))
             amount_val = abs(int(float(amount)))
 
-            self._generate_timestamp_and_request_id()
-            
-            unsigned_params = self._build_params(account=username, amount=str(amount_val))
-            signed_params = self._build_params(
-                account=username,
-                amount=str(amount_val),
-                sign=self._generate_signature(unsigned_params, self.app_secret)
-            )
-
             api_url = self.WITHDRAW_URL if flow_type == "withdraw" else self.DEPOSIT_URL
-            response = requests.post(api_url, headers=self.HEADERS, data=signed_params).json()
+            response = self._signed_post(api_url, account=username, amount=str(amount_val))
 
             if response.get("code") == 200:
                 return {"status": "success", "message": "Transaction successful"}
@@ -1,6 +1,7 @@
 import importlib
 import logging
-from typing import Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Type
 from app.services.scrapers.base import BaseGameScraper
 
 logger = logging.getLogger(__name__)
@@ -33,12 +34,19 @@ class ScraperFactory:
         "vegasroll": ("app.services.scrapers.vegasroll", "VegasRollScraper"),
     }
 
+    # Resolved scraper classes, so each module is imported and looked up once
+    _class_cache: Dict[str, Type[BaseGameScraper]] = {}
+
     @classmethod
     def get_scraper_class(cls, game_name: str) -> Type[BaseGameScraper]:
         """
         Dynamically import and return the scraper class for a given game.
         """
         game_key = game_name.lower()
+        scraper_class = cls._class_cache.get(game_key)
+        if scraper_class is not None:
+            return scraper_class
+
         if game_key not in cls.SCRAPER_MAP:
             raise ValueError(f"Unsupported game: {game_name}")
 
@@ -47,6 +55,7 @@ class ScraperFactory:
         try:
             module = importlib.import_module(module_path)
             scraper_class = getattr(module, class_name)
+            cls._class_cache[game_key] = scraper_class
             return scraper_class
         except ImportError as e:
             logger.error(f"Failed to import module {module_path}: {e}")
@@ -59,6 +68,38 @@ class ScraperFactory:
     def create_scraper(cls, game_name: str) -> BaseGameScraper:
         """
         Instantiate a scraper for the given game.
+        Scrapers are context managers, so `with create_scraper(name) as s:`
+        releases their browser and HTTP connections when done.
         """
         scraper_class = cls.get_scraper_class(game_name)
         return scraper_class()
+
+    @classmethod
+    def preload(cls) -> List[str]:
+        """
+        Import every registered scraper up front so the first task for a
+        game doesn't pay its module import cost.
+
+        Modules are imported on a small thread pool so their file reads
+        overlap. Returns the games whose module failed to load.
+        """
+        def load(game_key: str) -> bool:
+            try:
+                cls.get_scraper_class(game_key)
+                return True
+            except (ImportError, AttributeError):
+                # Already logged by get_scraper_class
+                return False
+            except Exception:
+                # Module-level code can fail in other ways (e.g. starting a
+                # browser); one bad scraper must not take the worker down
+                logger.exception(f"Scraper {game_key} raised while importing")
+                return False
+
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="scraper-preload") as executor:
+            loaded = dict(zip(cls.SCRAPER_MAP, executor.map(load, cls.SCRAPER_MAP), strict=True))
+
+        failed = [game_key for game_key, ok in loaded.items() if not ok]
+        if failed:
+            logger.error(f"Scrapers failed to preload: {', '.join(failed)}")
+        return failed
@@ -1,17 +1,29 @@
-import json
+import logging
+import asyncio
+import os
+import tempfile
 import time
 import re
-import random
+from pathlib import Path
 import requests
-import undetected_chromedriver as uc
+import httpx
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
+from app.services.scrapers.base import UsernameMixin
+from app.services.scrapers.login_pool import block_images, login_driver_pool
 from app.services.captcha.captcha import solving_captcha
 
+logger = logging.getLogger(__name__)
 
-class GameVault999Scraper:
+_COOKIE_RE = re.compile(r"__cookie\d*=([^;]*)")
+
+
+class GameVault999Scraper(UsernameMixin):
     BASE_URL = "https://agent.gamevault999.com"
     ENDPOINTS = {
         "balance": f"{BASE_URL}/api/agent/balance",
@@ -25,15 +37,59 @@ class GameVault999Scraper:
         "deposit_index": f"{BASE_URL}/userManagement",
         "store_const": f"{BASE_URL}/HomeDetail"
     }
+    BASE_HEADERS = {
+        'accept': 'application/json, text/plain, */*',
+        'accept-language': 'en-US,en;q=0.9',
+        'content-type': 'application/json;charset=UTF-8',
+        'origin': BASE_URL,
+        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+    }
     GAME_NAME = "gamevault999"
     GAME_INITIAL = "gv"
 
+    # Shared by every instance so async balance checks overlap on one pool
+    _async_client = None
+
     def __init__(self, username: str = None, password: str = None):
         self.username = username or settings.GAMEVAULT999_USER
         self.password = password or settings.GAMEVAULT999_PASS
         self.token = None
         self.cookie = None
         self.agent_id = None
+        self._cookie_field_cached = None
+        self._token_cache_path = Path(settings.TOKEN_CACHE_DIR) / f"gamevault999_{self.username}.json"
+
+        # Keep-alive pool so consecutive API calls reuse one TLS connection.
+        # Retry's default allowed methods exclude POST, so transactions are never replayed.
+        self._session = requests.Session()
+        self._session.headers.update(self.BASE_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self):
+        self._session.close()
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        if cls._async_client is None or cls._async_client.is_closed:
+            cls._async_client = httpx.AsyncClient(
+                http2=True,
+                headers=cls.BASE_HEADERS,
+                timeout=10,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return cls._async_client
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _fill_input_fields(self, driver):
         user_input = WebDriverWait(driver, 10).until(
@@ -62,19 +118,31 @@ class GameVault999Scraper:
 
         return img_element, login_btn, captcha_field
 
-    def _fetch_token_selenium(self):
-        options = uc.ChromeOptions()
-        options.headless = True
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument("--disable-gpu")
-        
-        caps = options.to_capabilities()
-        caps['goog:loggingPrefs'] = {'performance': 'ALL'}
+    @staticmethod
+    def _wait_for_auth_headers(driver, timeout: float):
+        # Each get_log call only returns entries logged since the last one,
+        # so this stops at the first request that carries the token
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for entry in driver.get_log("performance"):
+                message = entry["message"]
+                if "Network.requestWillBeSentExtraInfo" not in message:
+                    continue
+                headers = orjson.loads(message)["message"]["params"].get("headers", {})
+                if "Authorization" in headers and "Cookie" in headers:
+                    return headers["Authorization"], headers["Cookie"]
+            time.sleep(0.25)
+        return None
 
-        driver = uc.Chrome(options=options)
+    def _fetch_token_selenium(self):
+        driver = login_driver_pool.acquire()
+        broken = False
 
         try:
+            # Drop any session left by a previous login so the panel issues a fresh token
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            # The browser may come from a panel that blocks images; the captcha needs them
+            block_images(driver, False)
             driver.get(f"{self.BASE_URL}/login")
             WebDriverWait(driver, 10).until(EC.url_to_be(f"{self.BASE_URL}/login"))
 
@@ -84,98 +152,158 @@ class GameVault999Scraper:
             result, _ = solving_captcha(driver, None, img_element)
             captcha_field.clear()
             captcha_field.send_keys(result)
+            driver.get_log("performance")  # discard requests made before login
             login_btn.click()
 
             # Wait for Login Success
             expected_url = f"{self.BASE_URL}/HomeDetail"
             WebDriverWait(driver, 15).until(EC.url_to_be(expected_url))
-            time.sleep(2)
-            driver.refresh()
-            WebDriverWait(driver, 15).until(EC.url_to_be(expected_url))
-            time.sleep(5)
-
-            logs = driver.get_log("performance")
-
-            for entry in logs:
-                try:
-                    log = json.loads(entry["message"])["message"]
-                    if log["method"] == "Network.requestWillBeSentExtraInfo":
-                        headers = log["params"]["headers"]
-                        if "Authorization" in headers and "Cookie" in headers:
-                            self.token = headers["Authorization"]
-                            self.cookie = headers["Cookie"]
-                            break
-                except:
-                    continue
 
-        except Exception as e:
-            print(f"Token fetch failed: {e}")
+            # The dashboard's API calls carry the token; reload if none was seen
+            auth = self._wait_for_auth_headers(driver, 5)
+            if auth is None:
+                driver.refresh()
+                WebDriverWait(driver, 15).until(EC.url_to_be(expected_url))
+                auth = self._wait_for_auth_headers(driver, 10)
+            if auth:
+                self.token, self.cookie = auth
+
+        except Exception:
+            logger.exception("Token fetch failed")
+            # A wedged browser is replaced instead of going back to the pool
+            broken = True
         finally:
-            driver.quit()
+            login_driver_pool.release(driver, discard=broken)
 
         return self.token and self.cookie
 
+    def _load_cached_token(self) -> bool:
+        try:
+            cached = orjson.loads(self._token_cache_path.read_bytes())
+        except (OSError, ValueError):
+            return False
+        if cached.get("exp", 0) <= time.time():
+            return False
+        self.token = cached["token"]
+        self.cookie = cached["cookie"]
+        self.agent_id = cached["agent_id"]
+        return True
+
+    def _save_cached_token(self):
+        # Write to a temp file and rename so readers never see a partial file
+        try:
+            self._token_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._token_cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps({
+                    "token": self.token,
+                    "cookie": self.cookie,
+                    "agent_id": self.agent_id,
+                    "exp": time.time() + settings.TOKEN_TTL_SEC,
+                }))
+            os.replace(tmp_path, self._token_cache_path)
+        except OSError as e:
+            logger.warning("Token cache write failed: %s", e)
+
+    def invalidate_token(self):
+        self.token = None
+        self.cookie = None
+        self._token_cache_path.unlink(missing_ok=True)
+
     def authenticate(self):
+        self._cookie_field_cached = None
+        # Workers share the last captured session instead of each solving a captcha
+        if self._load_cached_token():
+            return
         if not self._fetch_token_selenium():
             raise Exception("Failed to authenticate GameVault999 via Selenium")
         self._fetch_agent_id()
+        self._save_cached_token()
 
     def _get_headers(self, referer_url: str) -> dict:
         if not self.token or not self.cookie:
             self.authenticate()
         return {
-            'accept': 'application/json, text/plain, */*',
-            'accept-language': 'en-US,en;q=0.9',
             'authorization': self.token,
-            'content-type': 'application/json;charset=UTF-8',
             'cookie': self.cookie,
-            'origin': self.BASE_URL,
             'referer': referer_url,
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
         }
 
     def _fetch_agent_id(self):
         if self.agent_id is None:
             headers = self._get_headers(self.REFERER_LINKS["store_const"])
-            payload = '{"locale":"en","timezone":"cst"}'
-            response = requests.post(self.ENDPOINTS["store_const"], headers=headers, data=payload)
-            data = response.json()
+            payload = orjson.dumps({"locale": "en", "timezone": "cst"})
+            response = self._session.post(self.ENDPOINTS["store_const"], headers=headers, data=payload)
+            data = orjson.loads(response.content)
             if data.get("code") == 200:
                 self.agent_id = data["data"]["agent_id"]
             else:
                 raise Exception(f"Failed to fetch agent_id: {data}")
 
-    def _fetch_cookie_string(self):
-        filtered_cookie = ""
-        if self.cookie:
-            match = re.search(r"__cookie\d*=(.*?)(?:;|$)", self.cookie)
-            if match:
-                filtered_cookie = f'"__cookie": "{match.group(1)}",'
-        return filtered_cookie
+    def _cookie_field(self) -> dict:
+        # Only changes when authenticate() swaps the cookie
+        if self._cookie_field_cached is None:
+            match = _COOKIE_RE.search(self.cookie or "")
+            self._cookie_field_cached = {"__cookie": match.group(1)} if match else {}
+        return self._cookie_field_cached
+
+    @staticmethod
+    def _is_unauthorized(response, data) -> bool:
+        return response.status_code == 401 or (isinstance(data, dict) and data.get("status_code") == 401)
+
+    def _post(self, url: str, referer_url: str, fields: dict, with_cookie: bool = False) -> dict:
+        """
+        POST a JSON body to the panel. A rejected session is evicted from the
+        shared token cache so other workers stop reusing it, and the call is
+        retried once after logging in again. A 401 means the panel did nothing,
+        so this is safe for transactions too.
+        """
+        for attempt in range(2):
+            headers = self._get_headers(referer_url)
+            # __cookie belongs to the session, so it is rebuilt after a re-login
+            body = {**fields, **self._cookie_field()} if with_cookie else fields
+            payload = orjson.dumps({**body, "locale": "en", "timezone": "cst"})
+            response = self._session.post(url, headers=headers, data=payload)
+            try:
+                data = orjson.loads(response.content)
+            except ValueError:
+                data = None
+            if self._is_unauthorized(response, data):
+                self.invalidate_token()
+                if attempt == 0:
+                    continue
+                return {"msg": "Session expired, please retry"}
+            if not isinstance(data, dict):
+                return {"msg": f"Unexpected response from panel (HTTP {response.status_code})"}
+            return data
 
-    def _check_site_status(self) -> bool:
+    async def _fetch_balance_async(self):
+        # Selenium login blocks, so keep it off the event loop
+        if not self.token or not self.cookie:
+            await asyncio.to_thread(self.authenticate)
+        headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
+        payload = orjson.dumps({"agent_id": self.agent_id, "locale": "en", "timezone": "cst"})
+        response = await self._get_async_client().post(self.ENDPOINTS["balance"], headers=headers, content=payload)
         try:
-            response = requests.get(self.BASE_URL, timeout=10)
-            return response.status_code == 200
-        except:
-            return False
+            data = orjson.loads(response.content)
+        except ValueError:
+            data = {}
+        return data, self._is_unauthorized(response, data)
 
     async def get_agent_balance(self):
         try:
-            if not self._check_site_status():
+            try:
+                data, auth_error = await self._fetch_balance_async()
+            except httpx.TransportError:
+                # A failed connect or timeout on the first call means the site is down
                 return None, "Site unreachable"
 
-            headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-            payload = f'{{"agent_id":{self.agent_id},"locale":"en","timezone":"cst"}}'
-            response = requests.post(self.ENDPOINTS["balance"], headers=headers, data=payload)
-            data = response.json()
-
-            if data.get("status_code") == 401 or not (data.get("code") == 200 and data.get("data")):
-                self.authenticate()
-                headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-                payload = f'{{"agent_id":{self.agent_id},"locale":"en","timezone":"cst"}}'
-                response = requests.post(self.ENDPOINTS["balance"], headers=headers, data=payload)
-                data = response.json()
+            # Rate limits and maintenance pages aren't worth a captcha login;
+            # only a rejected session is evicted and replaced
+            if auth_error:
+                self.invalidate_token()
+                await asyncio.to_thread(self.authenticate)
+                data, _ = await self._fetch_balance_async()
 
             if data.get("code") == 200 and data.get("data"):
                 return float(data["data"]["t"]), "Success"
@@ -185,15 +313,6 @@ class GameVault999Scraper:
         except Exception as e:
             return None, str(e)
 
-    def _generate_username(self, fullname: str) -> str:
-        n = fullname.lower().split()
-        base = f"{self.GAME_INITIAL}{n[0]}{n[-1][0]}" if n else f"{self.GAME_INITIAL}user"
-        base = base[:10]
-        username = f"{base}{random.randrange(100):02d}"
-        if len(username) < 7:
-            username += "".join(str(random.randint(0, 9)) for _ in range(7 - len(username)))
-        return username
-
     def player_signup(self, fullname: str, requested_username: str = None):
         try:
             if not requested_username:
@@ -202,13 +321,15 @@ class GameVault999Scraper:
             nickname = fullname.replace(" ", "")[:10]
             password = requested_username
 
-            headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-            cookie_str = self._fetch_cookie_string()
-
-            payload = f'{{"account":"{requested_username}","nickname":"{nickname}","rechargeamount":"","login_pwd":"{password}","check_pwd":"{password}","captcha":null,"t":"",{cookie_str}"locale":"en","timezone":"cst"}}'
-
-            response = requests.post(self.ENDPOINTS["signup"], headers=headers, data=payload)
-            data = response.json()
+            data = self._post(self.ENDPOINTS["signup"], self.REFERER_LINKS["deposit_index"], {
+                "account": requested_username,
+                "nickname": nickname,
+                "rechargeamount": "",
+                "login_pwd": password,
+                "check_pwd": password,
+                "captcha": None,
+                "t": "",
+            }, with_cookie=True)
 
             if data.get("code") == 200 and data.get("msg") == "success":
                 return {
@@ -224,10 +345,9 @@ class GameVault999Scraper:
             return {"status": "error", "message": str(e)}
 
     def _get_user_info(self, username: str):
-        headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-        payload = f'{{"type":1,"search":"{username}","page":1,"limit":20,"locale":"en","timezone":"cst"}}'
-        response = requests.post(self.ENDPOINTS["search_user"], headers=headers, data=payload)
-        data = response.json()
+        data = self._post(self.ENDPOINTS["search_user"], self.REFERER_LINKS["deposit_index"], {
+            "type": 1, "search": username, "page": 1, "limit": 20,
+        })
 
         if data.get("count", 0) > 0 and data.get("data"):
             for user in data["data"]["list"]:
@@ -252,13 +372,15 @@ class GameVault999Scraper:
             amount_val = abs(int(float(amount)))
 
             opera_type = 1 if flow_type == "deposit" else 2
-            cookie_str = self._fetch_cookie_string()
-
-            payload = f'{{"user_id":"{user_id}","type":{opera_type},"account":"{username}","balance":{user_balance},"amount":"{amount_val}","remark":"",{cookie_str}"locale":"en","timezone":"cst"}}'
 
-            headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-            response = requests.post(self.ENDPOINTS["recharge_redeem"], headers=headers, data=payload)
-            result = response.json()
+            result = self._post(self.ENDPOINTS["recharge_redeem"], self.REFERER_LINKS["deposit_index"], {
+                "user_id": str(user_id),
+                "type": opera_type,
+                "account": username,
+                "balance": float(user_balance),
+                "amount": str(amount_val),
+                "remark": "",
+            }, with_cookie=True)
 
             if result.get("code") == 200 and "The balance is not below the limit" not in result.get("msg", ""):
                 return {"status": "success", "message": result.get("msg", "Success")}
@@ -1,14 +1,21 @@
+import asyncio
+import logging
 import json
 import re
 import time
 import random
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class LasVegasSweepsScraper:
     BASE_URL = "https://agent.lasvegassweeps.com"
@@ -26,6 +33,9 @@ class LasVegasSweepsScraper:
     }
     GAME_NAME = "lasvegassweeps"
     GAME_INITIAL = "vs"
+    REQUEST_TIMEOUT = (3.05, 10)
+    # Shared by every instance so concurrent calls overlap on one pool
+    _async_client = None
 
     def __init__(self, username: str = None, password: str = None):
         self.username = username or settings.LASVEGASSWEEPS_USER
@@ -34,6 +44,33 @@ class LasVegasSweepsScraper:
         self.cookie = None
         self.agent_id = None
 
+        # Keep-alive pool so consecutive API calls reuse one TLS connection.
+        # Retry's default allowed methods exclude POST, so transactions are never replayed.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        ))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        if cls._async_client is None or cls._async_client.is_closed:
+            cls._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(15.0, connect=3.0),
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=30),
+            )
+        return cls._async_client
+
     def _fill_input_fields(self, driver):
         user_input = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, "//input[@type='text' and @placeholder='Account']"))
@@ -100,8 +137,8 @@ class LasVegasSweepsScraper:
                 except:
                     continue
 
-        except Exception as e:
-            print(f"Token fetch failed: {e}")
+        except Exception:
+            logger.exception("Token fetch failed")
         finally:
             driver.quit()
 
@@ -126,6 +163,12 @@ class LasVegasSweepsScraper:
             'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
         }
 
+    async def _get_headers_async(self, referer_url: str) -> dict:
+        # Selenium login blocks, so keep it off the event loop
+        if not self.token or not self.cookie:
+            await asyncio.to_thread(self.authenticate)
+        return self._get_headers(referer_url)
+
     def _fetch_cookie_value(self) -> str:
         if self.cookie:
             match = re.search(r"__cookie\d*=(.*?)(?:;|$)", self.cookie)
@@ -144,44 +187,42 @@ class LasVegasSweepsScraper:
                 "timezone": "cst",
                 "type": ""
             })
-            response = requests.post(self.ENDPOINTS["search_agent"], headers=headers, data=payload)
+            response = self.session.post(self.ENDPOINTS["search_agent"], headers=headers, data=payload, timeout=self.REQUEST_TIMEOUT)
             data = response.json()
             if data.get("code") == 200 and data.get("data", {}).get("list"):
                 self.agent_id = data["data"]["list"][0]["agent_id"]
             else:
                 raise Exception(f"Failed to fetch agent_id: {data}")
 
-    def _check_site_status(self) -> bool:
+    async def _check_site_status(self) -> bool:
         try:
-            response = requests.get(self.BASE_URL, timeout=10)
+            # requests followed redirects here; httpx only does when asked
+            response = await self._get_async_client().get(self.BASE_URL, timeout=10, follow_redirects=True)
             return response.status_code == 200
-        except:
+        except httpx.HTTPError:
             return False
 
+    async def _fetch_balance(self, headers: dict) -> dict:
+        payload = json.dumps({
+            "agent_id": self.agent_id,
+            "locale": "en",
+            "timezone": "cst"
+        })
+        response = await self._get_async_client().post(self.ENDPOINTS["balance"], headers=headers, content=payload)
+        return response.json()
+
     async def get_agent_balance(self):
         try:
-            if not self._check_site_status():
+            if not await self._check_site_status():
                 return None, "Site unreachable"
 
-            headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-            payload = json.dumps({
-                "agent_id": self.agent_id,
-                "locale": "en",
-                "timezone": "cst"
-            })
-            response = requests.post(self.ENDPOINTS["balance"], headers=headers, data=payload)
-            data = response.json()
+            headers = await self._get_headers_async(self.REFERER_LINKS["deposit_index"])
+            data = await self._fetch_balance(headers)
 
             if not (data.get("code") == 200 and data.get("data")) or data.get("status_code") == 401:
-                self.authenticate()
-                headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-                payload = json.dumps({
-                    "agent_id": self.agent_id,
-                    "locale": "en",
-                    "timezone": "cst"
-                })
-                response = requests.post(self.ENDPOINTS["balance"], headers=headers, data=payload)
-                data = response.json()
+                await asyncio.to_thread(self.authenticate)
+                headers = await self._get_headers_async(self.REFERER_LINKS["deposit_index"])
+                data = await self._fetch_balance(headers)
 
             if data.get("code") == 200 and data.get("data"):
                 return float(data["data"]["t"]), "Success"
@@ -221,7 +262,7 @@ class LasVegasSweepsScraper:
                 "timezone": "cst"
             })
 
-            response = requests.post(self.ENDPOINTS["signup"], headers=headers, data=payload)
+            response = self.session.post(self.ENDPOINTS["signup"], headers=headers, data=payload, timeout=self.REQUEST_TIMEOUT)
             data = response.json()
 
             if data.get("code") == 200 and data.get("msg") == "success":
@@ -237,8 +278,8 @@ class LasVegasSweepsScraper:
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
-    def _get_user_info(self, username: str):
-        headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
+    async def _get_user_info(self, username: str):
+        headers = await self._get_headers_async(self.REFERER_LINKS["deposit_index"])
         payload = json.dumps({
             "type": 1,
             "search": username,
@@ -247,7 +288,7 @@ class LasVegasSweepsScraper:
             "locale": "en",
             "timezone": "cst"
         })
-        response = requests.post(self.ENDPOINTS["search_user"], headers=headers, data=payload)
+        response = await self._get_async_client().post(self.ENDPOINTS["search_user"], headers=headers, content=payload)
         data = response.json()
 
         if data.get("count", 0) > 0 and data.get("data", {}).get("list"):
@@ -256,26 +297,17 @@ class LasVegasSweepsScraper:
                     return user
         return None
 
-    def recharge_user(self, username: str, amount: float):
-        return self._perform_transaction(username, amount, "deposit")
+    async def recharge_user(self, username: str, amount: float):
+        return await self._perform_transaction(username, amount, "deposit")
 
-    def redeem_user(self, username: str, amount: float):
-        return self._perform_transaction(username, amount, "withdraw")
+    async def redeem_user(self, username: str, amount: float):
+        return await self._perform_transaction(username, amount, "withdraw")
 
-    def _perform_transaction(self, username: str, amount: float, flow_type: str):
+    async def _perform_transaction(self, username: str, amount: float, flow_type: str):
         try:
-            # Get agent balance first
-            headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-            balance_payload = json.dumps({
-                "agent_id": self.agent_id,
-                "locale": "en",
-                "timezone": "cst"
-            })
-            balance_response = requests.post(self.ENDPOINTS["balance"], headers=headers, data=balance_payload)
-            balance_data = balance_response.json()
-            vendor_balance = float(balance_data.get("data", {}).get("t", 0)) if balance_data.get("code") == 200 else 0
+            headers = await self._get_headers_async(self.REFERER_LINKS["deposit_index"])
+            user_info = await self._get_user_info(username)
 
-            user_info = self._get_user_info(username)
             if not user_info:
                 return {"status": "error", "message": "User not found"}
 
@@ -296,8 +328,7 @@ class LasVegasSweepsScraper:
                 "timezone": "cst"
             })
 
-            headers = self._get_headers(self.REFERER_LINKS["deposit_index"])
-            response = requests.post(self.ENDPOINTS["recharge_redeem_user"], headers=headers, data=payload)
+            response = await self._get_async_client().post(self.ENDPOINTS["recharge_redeem_user"], headers=headers, content=payload)
             result = response.json()
 
             if result.get("code") == 200 and "The balance is not below the limit" not in result.get("msg", ""):
@@ -0,0 +1,40 @@
+"""
+Shared login browsers.
+Agent panels that capture auth headers from Chrome's performance log borrow
+from one small pool instead of each keeping its own Chrome processes.
+"""
+import atexit
+
+import undetected_chromedriver as uc
+
+from app.services.scrapers.driver_pool import WebDriverPool
+
+# Blocked per checkout by panels that don't need images (no image captcha)
+IMAGE_URL_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"]
+
+
+def _create_login_driver():
+    options = uc.ChromeOptions()
+    options.headless = True
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument("--disable-gpu")
+    # Only the auth headers matter, so don't wait on subresources
+    options.page_load_strategy = 'eager'
+    options.add_experimental_option("prefs", {"profile.default_content_setting_values.notifications": 2})
+    # Performance logging for header extraction; only Network events are read
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL', 'browser': 'OFF'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+    return uc.Chrome(options=options)
+
+
+def block_images(driver, enabled: bool):
+    """Toggle image blocking for this browser; it persists across checkouts."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": IMAGE_URL_PATTERNS if enabled else []})
+
+
+# Logins are short and serial per account, so two browsers cover all panels;
+# recycled every few uses to cap leaks
+login_driver_pool = WebDriverPool(_create_login_driver, max_drivers=2, max_uses=20)
+atexit.register(login_driver_pool.shutdown)
@@ -1,3 +1,4 @@
+import logging
 import json
 import time
 import random
@@ -8,6 +9,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class MrAllInOne777Scraper:
     BASE_URL = "https://agentserver.mrallinone777.com"
@@ -95,8 +98,8 @@ class MrAllInOne777Scraper:
                 except:
                     continue
 
-        except Exception as e:
-            print(f"Token fetch failed: {e}")
+        except Exception:
+            logger.exception("Token fetch failed")
         finally:
             driver.quit()
 
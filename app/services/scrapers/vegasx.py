@@ -1,3 +1,4 @@
+import logging
 import json
 import time
 import requests
@@ -7,6 +8,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 class VegasXScraper:
     BASE_URL = "https://cashier.vegas-x.org"
     ENDPOINTS = {
@@ -97,8 +100,8 @@ class VegasXScraper:
                             return True
                 except:
                     continue
-        except Exception as e:
-            print(f"Token fetch failed: {e}")
+        except Exception:
+            logger.exception("Token fetch failed")
         finally:
             driver.quit()
             
@@ -0,0 +1,111 @@
+"""
+Telegram Outbound Rate Limiter.
+Redis-backed token buckets shared by every worker process, so all workers
+stay within Telegram's limits together instead of each counting on its own.
+"""
+import asyncio
+import logging
+import time
+import weakref
+from typing import Union
+
+import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# How long to stop consulting Redis after it fails, in seconds
+REDIS_RETRY_INTERVAL = 60
+
+# Refills the bucket from the elapsed time and either takes the requested
+# tokens (returning 0) or returns how many seconds to wait before retrying.
+# Uses the Redis server clock so workers on different hosts agree.
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+# redis.asyncio connections belong to the loop that opened them, and receipts
+# are sent from their own background loop, so each loop gets its own client
+_scripts: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncScript]" = weakref.WeakKeyDictionary()
+_disabled_until = 0.0
+
+
+def _get_script() -> AsyncScript:
+    """Get or create the Redis client and registered bucket script for the running loop."""
+    loop = asyncio.get_running_loop()
+    script = _scripts.get(loop)
+    if script is None:
+        script = _scripts[loop] = redis.from_url(settings.REDIS_URL).register_script(_TOKEN_BUCKET_SCRIPT)
+    return script
+
+
+async def _take(key: str, rate: float, capacity: int, weight: int) -> None:
+    """Block until `weight` tokens are available in the bucket at `key`."""
+    global _disabled_until
+    # A bucket never holds more than `capacity` tokens, so a larger request would wait forever
+    if not 0 < weight <= capacity:
+        raise ValueError(f"weight must be between 1 and {capacity}, got {weight}")
+    if not settings.TELEGRAM_RATE_LIMIT_ENABLED or time.monotonic() < _disabled_until:
+        return
+
+    while True:
+        try:
+            wait = float(await _get_script()(keys=[key], args=[rate, capacity, weight]))
+        except Exception as e:
+            # Fail open: a Redis outage must not stop bots from replying
+            logger.warning(f"Telegram rate limiter unavailable, skipping for {REDIS_RETRY_INTERVAL}s: {e}")
+            _disabled_until = time.monotonic() + REDIS_RETRY_INTERVAL
+            return
+        if wait <= 0:
+            return
+        await asyncio.sleep(wait)
+
+
+async def acquire(bot_id: str, weight: int = 1) -> None:
+    """Wait for a slot in the bot-wide bucket (30 messages/second)."""
+    await _take(
+        f"tg:rl:bot:{bot_id}",
+        settings.TELEGRAM_BOT_RATE_PER_SECOND,
+        settings.TELEGRAM_BOT_RATE_PER_SECOND,
+        weight,
+    )
+
+
+async def acquire_chat(chat_id: Union[str, int], weight: int = 1) -> None:
+    """Wait for a slot in a group/channel bucket (20 messages/minute)."""
+    await _take(
+        f"tg:rl:chat:{chat_id}",
+        settings.TELEGRAM_GROUP_RATE_PER_MINUTE / 60,
+        settings.TELEGRAM_GROUP_RATE_PER_MINUTE,
+        weight,
+    )
+
+
+def is_group_chat(chat_id: Union[str, int, None]) -> bool:
+    """Groups and channels have negative IDs or @usernames."""
+    if chat_id is None:
+        return False
+    chat = str(chat_id)
+    return chat.startswith("-") or chat.startswith("@")
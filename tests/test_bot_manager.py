@@ -0,0 +1,24 @@
+"""
+Tests for the multi-bot manager service.
+"""
+from app.services.bot_manager import truncate_utf16
+
+
+class TestTruncateUtf16:
+    """Test Telegram-compatible message truncation."""
+
+    def test_short_text_unchanged(self):
+        """Test text under the limit is returned as-is."""
+        assert truncate_utf16("hello", 4096) == "hello"
+
+    def test_ascii_truncated_to_limit(self):
+        """Test ASCII text is cut at the limit."""
+        assert truncate_utf16("a" * 5000, 4096) == "a" * 4096
+
+    def test_emoji_counted_as_two_units(self):
+        """Test astral characters count as two UTF-16 code units."""
+        assert truncate_utf16("😀" * 3000, 4096) == "😀" * 2048
+
+    def test_split_surrogate_pair_dropped(self):
+        """Test a character that would be split in half is dropped."""
+        assert truncate_utf16("ab😀", 3) == "ab"
@@ -0,0 +1,87 @@
+"""
+Tests for Telegram command parsing.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import lxml.html
+import pytest
+
+from app.core.config import settings
+from app.services.bot_manager import BotConfig
+from app.services.command_handler import CommandHandler, TelegramUpdate
+from app.services.scraper import STATIC_MIN_TEXT_LENGTH, selenium_scraper
+
+
+def make_update(text: str) -> dict:
+    """Build a minimal Telegram update payload."""
+    return {
+        "update_id": 1,
+        "message": {
+            "message_id": 10,
+            "date": 1700000000,
+            "chat": {"id": 123, "type": "private"},
+            "from": {"id": 456, "username": "tester", "is_bot": False},
+            "text": text,
+        },
+    }
+
+
+class TestTelegramUpdateParsing:
+    """Test command and argument extraction."""
+
+    def test_command_without_args(self):
+        """Test a bare command."""
+        update = TelegramUpdate.from_dict(make_update("/start"))
+        assert update.command == "start"
+        assert update.command_args is None
+
+    def test_command_with_bot_mention(self):
+        """Test the @botname suffix is stripped from the command."""
+        update = TelegramUpdate.from_dict(make_update("/scrape@my_bot https://example.com wait=3"))
+        assert update.command == "scrape"
+        assert update.command_args == "https://example.com wait=3"
+        assert update.urls == ("https://example.com",)
+
+    def test_newline_separated_args(self):
+        """Test arguments on the line after the command."""
+        update = TelegramUpdate.from_dict(make_update("/batch\nhttps://a.com https://b.com"))
+        assert update.command == "batch"
+        assert update.command_args == "https://a.com https://b.com"
+
+    def test_plain_text_has_no_command(self):
+        """Test regular messages are not parsed as commands."""
+        update = TelegramUpdate.from_dict(make_update("hello https://example.com"))
+        assert update.command is None
+        assert update.urls == ("https://example.com",)
+        assert update.date is not None
+
+
+class TestScrapeCommand:
+    """Test how /scrape picks between the static and browser paths."""
+
+    @pytest.mark.asyncio
+    async def test_plain_scrape_uses_static_fetch(self, monkeypatch):
+        """Test the bot's default wait time doesn't force Chrome."""
+        page = f"<html><head><title>Example</title></head><body><p>{'x' * STATIC_MIN_TEXT_LENGTH}</p></body></html>"
+        fetched = []
+
+        def fake_fetch_static(url):
+            fetched.append(url)
+            return SimpleNamespace(text=page), lxml.html.fromstring(page)
+
+        monkeypatch.setattr(settings, "SCRAPER_STATIC_FIRST", True)
+        monkeypatch.setattr(selenium_scraper, "_fetch_static", fake_fetch_static)
+
+        bot = BotConfig(
+            bot_id="bot", bot_token="token", bot_name="Bot", channel_id="-100",
+            take_screenshot=False, send_to_channel=False,
+        )
+        client = AsyncMock()
+        update = TelegramUpdate.from_dict(make_update("/scrape https://example.com"))
+
+        result = await CommandHandler(None)._cmd_scrape(bot, client, update)
+
+        assert result["ok"] is True
+        assert fetched == ["https://example.com"]
+        assert client.send_scrape_result.await_args.kwargs["title"] == "Example"
@@ -0,0 +1,93 @@
+"""
+Tests for the WebDriver pool.
+"""
+import pytest
+
+from app.services.scrapers.driver_pool import WebDriverPool
+
+
+class FakeDriver:
+    """Minimal stand-in for a Selenium WebDriver."""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.quit_called = False
+        self.switch_to = self
+        self.visited = []
+
+    def window(self, handle):
+        pass
+
+    def close(self):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestWebDriverPool:
+    """Test driver reuse and bounding."""
+
+    def test_released_driver_is_reused(self):
+        """Test a released driver is handed out again after reset."""
+        pool = WebDriverPool(FakeDriver, max_drivers=2)
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        assert driver.visited == ["about:blank"]
+
+    def test_discarded_driver_is_quit(self):
+        """Test a broken driver is quit and replaced."""
+        pool = WebDriverPool(FakeDriver, max_drivers=1)
+        driver = pool.acquire()
+        pool.release(driver, discard=True)
+        assert driver.quit_called
+        assert pool.acquire() is not driver
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test the pool never exceeds its maximum size."""
+        pool = WebDriverPool(FakeDriver, max_drivers=1)
+        pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.01)
+
+    def test_driver_retired_after_max_uses(self):
+        """Test a driver is quit once it reaches max_uses checkouts."""
+        pool = WebDriverPool(FakeDriver, max_drivers=1, max_uses=2)
+        pool.warm()
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+        assert driver.quit_called
+        assert pool.acquire() is not driver
+
+    def test_checkout_discards_driver_on_error(self):
+        """Test a driver used in a failing with-block is not reused."""
+        pool = WebDriverPool(FakeDriver, max_drivers=1)
+        with pytest.raises(ValueError):
+            with pool.checkout() as driver:
+                raise ValueError("login failed")
+        assert driver.quit_called
+        with pool.checkout() as replacement:
+            assert replacement is not driver
+        assert pool.acquire() is replacement
+
+    def test_shutdown_quits_idle_drivers(self):
+        """Test shutdown quits every idle driver."""
+        pool = WebDriverPool(FakeDriver, max_drivers=2)
+        pool.warm()
+        drivers = [pool.acquire(), pool.acquire()]
+        for driver in drivers:
+            pool.release(driver)
+        pool.shutdown()
+        assert all(driver.quit_called for driver in drivers)